@@ -1,16 +1,37 @@
 import asyncio
-import base64
+import functools
+import hashlib
 import json
 import os
+import random
 import re
+import sqlite3
+import sys
+import threading
 import time
+from collections import OrderedDict
+from collections.abc import Callable
+from contextlib import asynccontextmanager
+from datetime import timedelta
 from typing import Any
 
+import httpx
+import orjson
+from aiolimiter import AsyncLimiter
 from dotenv import load_dotenv
+from pydantic import TypeAdapter, ValidationError
 
 from app.logger import get_logger
 from app.models import GeminiStructuredResponse
-from app.prompts import get_analysis_prompt
+from app.prompts import (
+    ANALYSIS_PROMPT_TEMPLATE,
+    ANALYSIS_SYSTEM_PROMPT,
+    get_analysis_prompt,
+    get_batch_analysis_prompt,
+    get_batch_frame_message,
+    get_frame_message,
+)
+from app.video_processor import MAX_FRAME_BYTES, downscale_jpeg, mean_luma, perceptual_hash
 
 logger = get_logger("gemini_analyzer")
 
@@ -57,6 +78,13 @@ except ImportError:
     GenerativeModel = None
     Part = None
 
+try:
+    from vertexai.preview import caching as vertex_caching
+    from vertexai.preview.generative_models import GenerativeModel as CachedGenerativeModel
+except ImportError:
+    vertex_caching = None  # Vertex AI context caching unavailable; full prompt sent per request
+    CachedGenerativeModel = None
+
 # Get authentication method from environment (default: vertex_ai)
 AUTH_METHOD = os.getenv("AUTH_METHOD", "vertex_ai").lower()
 logger.info(f"Authentication method: {AUTH_METHOD}")
@@ -65,6 +93,18 @@ logger.info(f"Authentication method: {AUTH_METHOD}")
 MODEL_NAME = os.getenv("MODEL_NAME", "gemini-2.5-flash")
 logger.info(f"Model selected: {MODEL_NAME}")
 
+# Frames packed into one multi-image request (1 = one request per frame)
+FRAMES_PER_REQUEST = max(1, int(os.getenv("FRAMES_PER_REQUEST", "4")))
+logger.info(f"Frames per request: {FRAMES_PER_REQUEST}")
+
+# Consecutive frames whose perceptual hashes differ by at most this many bits (out of 64)
+# share one analysis instead of each being sent (negative disables)
+NEAR_DUPLICATE_DISTANCE = int(os.getenv("NEAR_DUPLICATE_DISTANCE", "4"))
+
+# Frames darker than this mean luma (0-255) are fades or blank screens and get a default
+# response without an API request (0 disables)
+BLANK_FRAME_LUMA = float(os.getenv("BLANK_FRAME_LUMA", "10"))
+
 # Initialize Gemini API based on authentication method
 service_account_key_path = os.path.join(
     os.path.dirname(os.path.dirname(__file__)),
@@ -115,10 +155,23 @@ elif AUTH_METHOD == "api_key":
         raise ValueError("GEMINI_API_KEY is required when AUTH_METHOD=api_key")
 
     if USE_NEW_SDK:
-        client = genai.Client(api_key=api_key)
+        # Shared HTTP/2 connection pool so concurrent requests multiplex over one TLS session
+        try:
+            http_options = types.HttpOptions(
+                async_client_args={
+                    "http2": True,
+                    "limits": httpx.Limits(max_connections=50, max_keepalive_connections=25),
+                }
+            )
+        except Exception as e:
+            logger.warning(f"⚠️  HTTP/2 transport options unsupported by this SDK version: {e}")
+            http_options = None
+        client = genai.Client(api_key=api_key, http_options=http_options)
         logger.info(f"✅ Gemini API configured with API key using {MODEL_NAME}")
     else:
         genai.configure(api_key=api_key)
+        # One model instance shared by every request
+        client = genai.GenerativeModel(MODEL_NAME)
         logger.info(f"✅ Gemini API configured with legacy SDK using {MODEL_NAME}")
 
 else:
@@ -128,10 +181,154 @@ else:
         logger.error("❌ Service account key not found")
     raise ValueError("Invalid AUTH_METHOD or missing credentials")
 
-# Rate limiting
-semaphore = asyncio.Semaphore(10)  # Max 10 concurrent requests
-rate_limit_delay = 4.0  # 15 requests per minute = 4 seconds between requests
-last_request_time = 0.0
+# Rate limiting: the token bucket gates request rate, the admission controller gates concurrency
+# (defaults suit the free tier; raise both for paid quotas)
+REQUESTS_PER_MINUTE = max(1, int(os.getenv("REQUESTS_PER_MINUTE", "15")))
+limiter = AsyncLimiter(max_rate=REQUESTS_PER_MINUTE, time_period=60)  # Bursts allowed
+request_timeout = 60.0  # Seconds before a single Gemini request is abandoned and retried
+
+# Generation settings: deterministic single-candidate JSON, output capped per analyzed frame
+temperature = 0.0
+max_output_tokens_per_frame = 4096
+
+# Retry delay hint in 429 messages, e.g. "Please retry in 37.5s" or "'retryDelay': '37s'"
+_RETRY_DELAY_RE = re.compile(r"retry\w*\W+(?:in\s+)?(\d+(?:\.\d+)?)\s*s", re.IGNORECASE)
+
+# Lowercase substrings used to classify API errors from their message
+_RATE_LIMIT_MARKERS = ("429", "quota", "rate limit")
+_UNAVAILABLE_MARKERS = ("503", "unavailable", "overloaded")
+_QUOTA_MARKERS = ("quota", "free_tier", "resource_exhausted")
+_QUOTA_EXCEEDED_MARKERS = ("exceeded", "limit")
+
+# Validates (and dumps) a grouped request's JSON array in one call instead of one per frame
+_response_list_adapter = TypeAdapter(list[GeminiStructuredResponse])
+
+# On free-threaded builds (PEP 703) responses are parsed on worker threads, in parallel with each
+# other and the event loop; under the GIL that would only add thread hand-off overhead
+_parse_in_threads = not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+# Adaptive concurrency: halved on 429/503 backpressure, grown back by one after a success streak
+max_concurrency = max(1, int(os.getenv("MAX_CONCURRENT_REQUESTS", "10")))
+success_streak_to_grow = 5
+_concurrency_limit = max_concurrency
+_active_requests = 0
+_success_streak = 0
+_slot_condition = asyncio.Condition()
+
+# Context caching for the static analysis prompt (new SDK or Vertex AI)
+PROMPT_CACHE_TTL_SECONDS = 3600
+PROMPT_CACHE_RETRY_SECONDS = 300  # Cooldown before retrying after a transient cache failure
+# Cache creation errors that won't succeed later: unsupported model or a prompt below the minimum
+_PROMPT_CACHE_PERMANENT_MARKERS = (
+    "not supported",
+    "too small",
+    "min_total_token_count",
+    "not found",
+    "permission",
+)
+_prompt_cache_name: str | None = None
+_prompt_cache_model: Any = None  # Vertex AI model bound to the cached content
+_prompt_cache_expires_at = 0.0
+_prompt_cache_disabled = False
+_prompt_cache_lock = asyncio.Lock()
+
+# LRU cache of validated responses keyed by frame content hash (identical frames skip the API)
+response_cache_size = 512
+_response_cache: OrderedDict[bytes, dict[str, Any]] = OrderedDict()
+
+# Persistent response cache so re-analyzing the same video skips the API (empty path disables it)
+RESPONSE_CACHE_PATH = os.getenv(
+    "RESPONSE_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), ".cache", "gemini_responses.sqlite3"),
+)
+# Entries are only reused for the same model and prompt text
+_response_cache_namespace = hashlib.blake2b(
+    f"{MODEL_NAME}|{ANALYSIS_PROMPT_TEMPLATE}".encode(), digest_size=8
+).hexdigest()
+_disk_cache: sqlite3.Connection | None = None
+_disk_cache_disabled = not RESPONSE_CACHE_PATH
+_disk_cache_lock = threading.Lock()
+
+
+@asynccontextmanager
+async def concurrency_slot():
+    """Hold one in-flight request slot under the current adaptive concurrency limit."""
+    global _active_requests
+
+    async with _slot_condition:
+        await _slot_condition.wait_for(lambda: _active_requests < _concurrency_limit)
+        _active_requests += 1
+    try:
+        yield
+    finally:
+        # Decrement before awaiting the lock so a cancellation here can't leak the slot
+        _active_requests -= 1
+        async with _slot_condition:
+            _slot_condition.notify(1)
+
+
+def reduce_concurrency():
+    """Halve the concurrency limit after the API signals backpressure (429/503)."""
+    global _concurrency_limit, _success_streak
+
+    _success_streak = 0
+    if _concurrency_limit > 1:
+        _concurrency_limit = max(1, _concurrency_limit // 2)
+        logger.warning(f"📉 Backpressure detected, concurrency reduced to {_concurrency_limit}")
+
+
+async def record_success():
+    """Grow the concurrency limit by one after a streak of successful requests."""
+    global _concurrency_limit, _success_streak
+
+    _success_streak += 1
+    if _success_streak >= success_streak_to_grow and _concurrency_limit < max_concurrency:
+        _success_streak = 0
+        _concurrency_limit += 1
+        logger.info(f"📈 Concurrency increased to {_concurrency_limit}")
+        async with _slot_condition:
+            _slot_condition.notify_all()
+
+
+def get_retry_delay(error: Exception) -> float | None:
+    """
+    Get the server-suggested retry delay from a rate limit error.
+
+    Prefers the structured google.rpc.RetryInfo detail and falls back to the retry hint
+    in the error message.
+
+    Args:
+        error: Exception raised by the SDK
+
+    Returns:
+        Delay in seconds, or None if the error doesn't suggest one
+    """
+    details = getattr(error, "details", None)
+    if isinstance(details, dict):
+        # google-genai APIError: the JSON error body
+        for detail in details.get("error", {}).get("details", []):
+            delay = detail.get("retryDelay") if isinstance(detail, dict) else None
+            if isinstance(delay, str) and delay.endswith("s"):
+                try:
+                    return float(delay[:-1])
+                except ValueError:
+                    pass
+    elif isinstance(details, list):
+        # google.api_core exceptions (Vertex AI): decoded google.rpc detail messages
+        for detail in details:
+            delay = getattr(detail, "retry_delay", None)
+            if delay is not None:
+                if isinstance(delay, timedelta):
+                    return delay.total_seconds()
+                return delay.seconds + delay.nanos / 1e9
+
+    delay_match = _RETRY_DELAY_RE.search(str(error))
+    return float(delay_match.group(1)) if delay_match else None
+
+
+def jittered(delay: float) -> float:
+    """Spread a backoff over [delay, 2 * delay) so concurrent requests don't retry in lockstep."""
+    return delay + random.random() * delay
 
 
 def get_gemini_prompt(timestamp: float) -> str:
@@ -139,244 +336,604 @@ def get_gemini_prompt(timestamp: float) -> str:
     return get_analysis_prompt(timestamp)
 
 
-async def analyze_frame(frame_base64: str, timestamp: float, retries: int = 3) -> dict[str, Any]:
+async def get_prompt_cache_name() -> str | None:
+    """
+    Get the name of the cached content holding the static analysis prompt.
+
+    The cache is created on first use and re-created shortly before its TTL lapses.
+
+    Returns:
+        Cached content name, or None if context caching is unavailable
+    """
+    global _prompt_cache_name, _prompt_cache_model, _prompt_cache_expires_at, _prompt_cache_disabled
+
+    if _prompt_cache_disabled:
+        return None
+    if AUTH_METHOD == "api_key" and not USE_NEW_SDK:
+        return None
+    if AUTH_METHOD != "api_key" and (vertex_caching is None or CachedGenerativeModel is None):
+        return None
+
+    async with _prompt_cache_lock:
+        # A live cache, or None while cooling down after a transient failure
+        if time.monotonic() < _prompt_cache_expires_at:
+            return _prompt_cache_name
+
+        try:
+            if AUTH_METHOD == "api_key":
+                cache = await client.aio.caches.create(
+                    model=MODEL_NAME,
+                    config=types.CreateCachedContentConfig(
+                        system_instruction=ANALYSIS_SYSTEM_PROMPT,
+                        ttl=f"{PROMPT_CACHE_TTL_SECONDS}s",
+                    ),
+                )
+            else:
+                # The Vertex AI caching API is synchronous
+                cache = await asyncio.to_thread(
+                    vertex_caching.CachedContent.create,
+                    model_name=MODEL_NAME,
+                    system_instruction=ANALYSIS_SYSTEM_PROMPT,
+                    ttl=timedelta(seconds=PROMPT_CACHE_TTL_SECONDS),
+                )
+                _prompt_cache_model = CachedGenerativeModel.from_cached_content(
+                    cached_content=cache
+                )
+        except Exception as e:
+            _prompt_cache_name = None
+            _prompt_cache_model = None
+            if any(marker in str(e).lower() for marker in _PROMPT_CACHE_PERMANENT_MARKERS):
+                logger.warning(
+                    f"⚠️  Context caching unavailable, sending full prompt per frame: {str(e)}"
+                )
+                _prompt_cache_disabled = True
+            else:
+                logger.warning(
+                    f"⚠️  Context caching failed, retrying in {PROMPT_CACHE_RETRY_SECONDS}s: "
+                    f"{str(e)}"
+                )
+                _prompt_cache_expires_at = time.monotonic() + PROMPT_CACHE_RETRY_SECONDS
+            return None
+
+        _prompt_cache_name = cache.name
+        # Refresh a minute early so in-flight requests never reference an expired cache
+        _prompt_cache_expires_at = time.monotonic() + PROMPT_CACHE_TTL_SECONDS - 60
+        logger.info(f"🗄️  Cached static analysis prompt: {_prompt_cache_name}")
+        return _prompt_cache_name
+
+
+def _get_disk_cache() -> sqlite3.Connection | None:
+    """Open the on-disk response cache on first use. Call with _disk_cache_lock held."""
+    global _disk_cache, _disk_cache_disabled
+
+    if _disk_cache is None and not _disk_cache_disabled:
+        try:
+            os.makedirs(os.path.dirname(RESPONSE_CACHE_PATH) or ".", exist_ok=True)
+            _disk_cache = sqlite3.connect(RESPONSE_CACHE_PATH, check_same_thread=False)
+            _disk_cache.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(namespace TEXT, frame_key BLOB, response BLOB, PRIMARY KEY (namespace, frame_key))"
+            )
+            _disk_cache.commit()
+            logger.info(f"🗄️  Response cache: {RESPONSE_CACHE_PATH}")
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️  On-disk response cache disabled: {str(e)}")
+            _disk_cache = None
+            _disk_cache_disabled = True
+    return _disk_cache
+
+
+def read_disk_cache(frame_key: bytes) -> dict[str, Any] | None:
+    """Look up a response in the on-disk cache (blocking)."""
+    with _disk_cache_lock:
+        db = _get_disk_cache()
+        if db is None:
+            return None
+        try:
+            row = db.execute(
+                "SELECT response FROM responses WHERE namespace = ? AND frame_key = ?",
+                (_response_cache_namespace, frame_key),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️  Response cache read failed: {str(e)}")
+            return None
+    return orjson.loads(row[0]) if row else None
+
+
+def write_disk_cache(frame_key: bytes, response: dict[str, Any]):
+    """Persist a response in the on-disk cache (blocking)."""
+    with _disk_cache_lock:
+        db = _get_disk_cache()
+        if db is None:
+            return
+        try:
+            db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                (_response_cache_namespace, frame_key, orjson.dumps(response)),
+            )
+            db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️  Response cache write failed: {str(e)}")
+
+
+def remember_response(frame_key: bytes, response: dict[str, Any]):
+    """Add a response to the in-memory LRU, evicting the least recently used entry when full."""
+    _response_cache[frame_key] = response
+    _response_cache.move_to_end(frame_key)
+    if len(_response_cache) > response_cache_size:
+        _response_cache.popitem(last=False)
+
+
+async def get_cached_response(frame_key: bytes, timestamp: float) -> dict[str, Any] | None:
+    """Return a cached response for an identical frame, re-stamped with this timestamp."""
+    cached = _response_cache.get(frame_key)
+    if cached is not None:
+        _response_cache.move_to_end(frame_key)
+    elif not _disk_cache_disabled:
+        cached = await asyncio.to_thread(read_disk_cache, frame_key)
+        if cached is None:
+            return None
+        remember_response(frame_key, cached)
+    else:
+        return None
+    return {**cached, "timestamp": timestamp}
+
+
+async def store_cached_response(frame_key: bytes, response: dict[str, Any]):
+    """Store a validated response in the in-memory and on-disk caches."""
+    remember_response(frame_key, response)
+    if not _disk_cache_disabled:
+        await asyncio.to_thread(write_disk_cache, frame_key, response)
+
+
+def invalidate_prompt_cache():
+    """Forget the cached prompt so the next request re-creates it."""
+    global _prompt_cache_name, _prompt_cache_model, _prompt_cache_expires_at
+
+    _prompt_cache_name = None
+    _prompt_cache_model = None
+    _prompt_cache_expires_at = 0.0
+
+
+def get_frame_key(frame_bytes: bytes) -> bytes:
+    """Hash frame content for the response cache."""
+    return hashlib.blake2b(frame_bytes, digest_size=16).digest()
+
+
+async def shrink_frame(frame_bytes: bytes, timestamp: float) -> bytes:
+    """Downscale an oversized frame off the event loop, keeping the original on failure."""
+    if len(frame_bytes) <= MAX_FRAME_BYTES:
+        return frame_bytes
+    try:
+        return await asyncio.to_thread(downscale_jpeg, frame_bytes)
+    except RuntimeError as e:
+        logger.warning(f"⚠️  Sending original frame at {timestamp:.2f}s: {str(e)}")
+        return frame_bytes
+
+
+def parse_frame_response(response_text: str, timestamp: float) -> dict[str, Any]:
+    """Parse and validate a single-frame response in one Pydantic pass (blocking)."""
+    # The context timestamp is applied in case the schema doesn't enforce it
+    return GeminiStructuredResponse.model_validate_json(
+        response_text, context={"timestamp": timestamp}
+    ).model_dump()
+
+
+def parse_grouped_response(response_text: str, timestamps: list[float]) -> list[dict[str, Any]]:
+    """Parse and validate a grouped response's JSON array, one entry per timestamp (blocking)."""
+    json_data = orjson.loads(response_text)
+    if not isinstance(json_data, list) or len(json_data) != len(timestamps):
+        raise ValueError(f"Expected a JSON array of {len(timestamps)} analyses")
+
+    for timestamp, item in zip(timestamps, json_data):
+        if not isinstance(item, dict):
+            raise ValueError(f"Expected a JSON object per analysis, got {type(item).__name__}")
+        # Trust our own timestamps over whatever the model echoed back
+        item["timestamp"] = timestamp
+    return _response_list_adapter.dump_python(_response_list_adapter.validate_python(json_data))
+
+
+async def run_parser(parser, *args) -> Any:
+    """Run a response parser, on a worker thread when the interpreter is free-threaded."""
+    if _parse_in_threads:
+        return await asyncio.to_thread(parser, *args)
+    return parser(*args)
+
+
+@functools.lru_cache(maxsize=32)
+def get_generation_config(frame_count: int, cache_name: str | None = None) -> Any:
+    """
+    Build the generation config for the configured backend, once per distinct request shape.
+
+    Args:
+        frame_count: Number of frames in the request (output tokens are capped per frame)
+        cache_name: Cached content holding the static prompt (new SDK only)
+
+    Returns:
+        Generation config object (a plain dict for the legacy SDK)
+    """
+    generation_settings = {
+        "response_mime_type": "application/json",
+        "temperature": temperature,
+        "max_output_tokens": max_output_tokens_per_frame * frame_count,
+        "candidate_count": 1,
+    }
+
+    if AUTH_METHOD == "api_key" and not USE_NEW_SDK:
+        return generation_settings
+    if AUTH_METHOD == "api_key":
+        if cache_name:
+            return types.GenerateContentConfig(cached_content=cache_name, **generation_settings)
+        return types.GenerateContentConfig(**generation_settings)
+    return GenerationConfig(**generation_settings)
+
+
+async def _generate_legacy(frames: list[bytes], prompt: str, frame_message: str) -> Any:
+    """API key authentication with the legacy SDK's shared model."""
+    return await client.generate_content_async(
+        [*({"mime_type": "image/jpeg", "data": frame} for frame in frames), prompt],
+        generation_config=get_generation_config(len(frames)),
+    )
+
+
+async def _generate_genai(frames: list[bytes], prompt: str, frame_message: str) -> Any:
+    """API key authentication through the shared, connection-pooled client."""
+    image_parts = [types.Part.from_bytes(data=frame, mime_type="image/jpeg") for frame in frames]
+
+    # Static prompt lives in the context cache; only send the timestamps
+    cache_name = await get_prompt_cache_name()
+    contents = [*image_parts, frame_message if cache_name else prompt]
+
+    return await client.aio.models.generate_content(
+        model=MODEL_NAME,
+        contents=contents,
+        config=get_generation_config(len(frames), cache_name),
+    )
+
+
+async def _generate_vertex(frames: list[bytes], prompt: str, frame_message: str) -> Any:
+    """Vertex AI with service account."""
+    image_parts = [Part.from_data(data=frame, mime_type="image/jpeg") for frame in frames]
+
+    # Static prompt lives in the context cache; only send the timestamps
+    cached_model = _prompt_cache_model if await get_prompt_cache_name() else None
+    if cached_model is not None:
+        model, contents = cached_model, [*image_parts, frame_message]
+    else:
+        model, contents = client, [*image_parts, prompt]
+
+    return await model.generate_content_async(
+        contents=contents,
+        generation_config=get_generation_config(len(frames)),
+    )
+
+
+# Pick the request function once; the auth method and SDK are fixed at import
+if AUTH_METHOD == "api_key" and not USE_NEW_SDK:
+    _generate = _generate_legacy
+elif AUTH_METHOD == "api_key":
+    _generate = _generate_genai
+else:
+    if GenerationConfig is None or Part is None:
+        raise ImportError("vertexai.generative_models is required for Vertex AI")
+    _generate = _generate_vertex
+
+
+async def generate_analysis(frames: list[bytes], prompt: str, frame_message: str) -> Any:
+    """
+    Send JPEG frames and the analysis prompt to Gemini using the configured backend.
+
+    Args:
+        frames: JPEG-encoded images, in order
+        prompt: Full analysis prompt
+        frame_message: Short message sent instead of prompt when the static prompt is cached
+
+    Returns:
+        Raw SDK response
+    """
+    return await asyncio.wait_for(_generate(frames, prompt, frame_message), timeout=request_timeout)
+
+
+def get_response_text(response: Any) -> str:
+    """Extract the (JSON) text from an SDK response."""
+    if not response:
+        raise ValueError("Invalid response from Gemini API: empty response")
+
+    # Get text from response (should be valid JSON when using structured output)
+    try:
+        response_text = response.text.strip()
+    except AttributeError:
+        # Fallback if response structure is different
+        response_text = str(response).strip()
+
+    if not response_text:
+        raise ValueError("Empty response from Gemini API")
+    return response_text
+
+
+async def back_off_after_error(e: Exception, attempt: int, retries: int) -> str | None:
+    """
+    Classify a failed Gemini attempt and sleep before the next one.
+
+    Args:
+        e: Error raised by the attempt
+        attempt: Zero-based attempt number
+        retries: Total number of attempts
+
+    Returns:
+        None to retry, or the error message for a default response once retries run out
+
+    Raises:
+        QuotaExhaustedError: If the API quota is exhausted
+        ServiceUnavailableError: If the service is still overloaded on the last attempt
+    """
+    if isinstance(e, TimeoutError):
+        logger.warning(f"⏱️  Request timeout on attempt {attempt + 1}")
+        if attempt < retries - 1:
+            backoff_time = jittered(2**attempt)
+            logger.debug("⏳ Retrying after %.1fs", backoff_time)
+            await asyncio.sleep(backoff_time)
+            return None
+        logger.error(f"❌ Request timeout after {retries} attempts")
+        return "Request timeout"
+
+    error_msg = str(e)
+    error_lower = error_msg.lower()
+    logger.warning(f"⚠️  API error on attempt {attempt + 1}: {error_msg}")
+
+    # Check for 503 Service Unavailable (overloaded)
+    if any(marker in error_lower for marker in _UNAVAILABLE_MARKERS):
+        reduce_concurrency()
+        if attempt < retries - 1:
+            # Longer backoff for 503 errors (exponential with longer base)
+            backoff_time = jittered(min(30, 5 * (2**attempt)))  # Max 30-60 seconds
+            logger.warning(f"🔄 Service overloaded (503), retrying after {backoff_time:.1f}s...")
+            await asyncio.sleep(backoff_time)
+            return None
+        logger.error("❌ Service unavailable after retries")
+        raise ServiceUnavailableError("Gemini API is currently overloaded. Please try again later.")
+
+    # Check for quota exhaustion (429 with quota exceeded message)
+    is_quota_exhausted = (
+        "429" in error_lower
+        and any(marker in error_lower for marker in _QUOTA_MARKERS)
+        and any(marker in error_lower for marker in _QUOTA_EXCEEDED_MARKERS)
+    )
+
+    if is_quota_exhausted:
+        logger.error("❌ API quota exhausted (daily limit reached)")
+        logger.error(
+            "💡 Free tier limit: 20 requests per day. Please upgrade or wait until tomorrow."
+        )
+        raise QuotaExhaustedError(
+            "Gemini API daily quota exhausted. Free tier allows 20 requests per day. "
+            "Please upgrade your plan or try again tomorrow."
+        )
+
+    # Check for rate limit (429 but not quota exhausted - temporary)
+    if "429" in error_lower:
+        reduce_concurrency()
+        if attempt < retries - 1:
+            # Use the server's retry delay if it sent one (max 120s)
+            server_delay = get_retry_delay(e)
+            retry_delay = 60.0 if server_delay is None else min(120.0, server_delay)
+            # Add a 1-5s random buffer so throttled requests don't all retry together
+            retry_delay += random.uniform(1, 5)
+            logger.warning(f"🚫 Rate limit hit, waiting {retry_delay:.1f}s before retry")
+            await asyncio.sleep(retry_delay)
+            return None
+        logger.error("❌ Rate limit exceeded after retries")
+        return "Rate limit exceeded. Please try again later."
+
+    # Other errors - exponential backoff
+    if attempt < retries - 1:
+        backoff_time = jittered(2**attempt)
+        logger.debug("⏳ Retrying after %.1fs", backoff_time)
+        await asyncio.sleep(backoff_time)
+        return None
+    logger.error(f"❌ API error after {retries} attempts: {error_msg}")
+    return f"API error: {error_msg}"
+
+
+async def analyze_frame(frame_bytes: bytes, timestamp: float, retries: int = 3) -> dict[str, Any]:
     """
     Analyze a single frame using Gemini Vision API.
 
     Args:
-        frame_base64: Base64-encoded JPEG image
+        frame_bytes: JPEG-encoded image bytes
         timestamp: Frame timestamp in seconds
         retries: Number of retry attempts on failure
 
     Returns:
         Parsed JSON response from Gemini
     """
-    global last_request_time
+    logger.debug("🔍 Analyzing frame at timestamp %.2fs", timestamp)
 
-    logger.debug(f"🔍 Analyzing frame at timestamp {timestamp:.2f}s")
+    if not frame_bytes:
+        logger.error("❌ Empty frame bytes provided")
+        return get_default_response(timestamp, "Frame error: empty frame bytes")
 
-    async with semaphore:
-        # Rate limiting: ensure at least 4 seconds between requests
-        current_time = time.time()
-        time_since_last = current_time - last_request_time
-        if time_since_last < rate_limit_delay:
-            wait_time = rate_limit_delay - time_since_last
-            logger.debug(f"⏳ Rate limiting: waiting {wait_time:.2f}s before next request")
-            await asyncio.sleep(wait_time)
-        last_request_time = time.time()
+    # Identical frames (stoppages, static shots) reuse the earlier analysis
+    frame_key = get_frame_key(frame_bytes)
+    cached = await get_cached_response(frame_key, timestamp)
+    if cached is not None:
+        logger.debug("♻️  Reusing cached analysis for identical frame at %.2fs", timestamp)
+        return cached
 
-        prompt = get_gemini_prompt(timestamp)
+    # Shrink oversized frames once rather than re-sending them on every attempt
+    frame_bytes = await shrink_frame(frame_bytes, timestamp)
 
-        # Decode base64 to bytes for Gemini
-        try:
-            if not frame_base64 or len(frame_base64) == 0:
-                raise ValueError("Empty base64 string provided")
-            frame_bytes = base64.b64decode(frame_base64)
-            if len(frame_bytes) == 0:
-                raise ValueError("Decoded frame bytes are empty")
-            logger.debug(f"📤 Sending frame to Gemini API (size: {len(frame_bytes) / 1024:.2f} KB)")
-        except Exception as e:
-            logger.error(f"❌ Failed to decode base64 frame: {str(e)}")
-            return get_default_response(timestamp, f"Frame decoding error: {str(e)}")
+    prompt = get_gemini_prompt(timestamp)
 
-        for attempt in range(retries):
-            try:
-                logger.debug(
-                    f"🔄 Gemini API request attempt {attempt + 1}/{retries} for timestamp {timestamp:.2f}s"
-                )
+    logger.debug("📤 Sending frame to Gemini API (size: %.2f KB)", len(frame_bytes) / 1024)
 
-                # Validate frame bytes before sending
-                if len(frame_bytes) > 20 * 1024 * 1024:  # 20MB limit for Gemini
-                    logger.warning(
-                        f"⚠️  Frame size ({len(frame_bytes) / 1024 / 1024:.2f} MB) exceeds recommended limit"
+    for attempt in range(retries):
+        try:
+            logger.debug(
+                "🔄 Gemini API request attempt %d/%d for timestamp %.2fs",
+                attempt + 1,
+                retries,
+                timestamp,
+            )
+
+            # Send image + prompt to Gemini with structured output. Each attempt takes a
+            # fresh rate token, and the slot is held only for the request itself, not for
+            # backoff sleeps. The token comes first so waiting for the bucket doesn't hold
+            # a slot that another in-flight request could use
+            try:
+                async with limiter, concurrency_slot():
+                    response = await generate_analysis(
+                        [frame_bytes], prompt, get_frame_message(timestamp)
                     )
+            except TimeoutError:
+                raise
+            except Exception as e:
+                error_msg = str(e)
+                error_lower = error_msg.lower()
+                if "cached" in error_lower:
+                    # Cache was evicted server-side; re-create it on the next attempt
+                    invalidate_prompt_cache()
+                if any(marker in error_lower for marker in _RATE_LIMIT_MARKERS):
+                    raise  # Re-raise rate limit errors to be handled separately
+                logger.error(f"❌ Gemini API request failed: {error_msg}")
+                raise RuntimeError(f"API request failed: {error_msg}")
 
-                # Send image + prompt to Gemini with structured output
-                try:
-                    if AUTH_METHOD == "api_key":
-                        # API key authentication
-                        api_key = os.getenv("GEMINI_API_KEY")
-                        temp_client = genai.Client(api_key=api_key)
-
-                        image_part = types.Part.from_bytes(data=frame_bytes, mime_type="image/jpeg")
-                        config = types.GenerateContentConfig(
-                            response_mime_type="application/json",
-                        )
-
-                        response = await asyncio.to_thread(
-                            temp_client.models.generate_content,
-                            model=MODEL_NAME,
-                            contents=[image_part, prompt],
-                            config=config,
-                        )
-                    elif AUTH_METHOD == "vertex_ai":
-                        # Vertex AI with service account
-                        if GenerationConfig is None or Part is None:
-                            raise ImportError(
-                                "vertexai.generative_models is required for Vertex AI"
-                            )
-
-                        image_part = Part.from_data(data=frame_bytes, mime_type="image/jpeg")
-
-                        generation_config = GenerationConfig(
-                            response_mime_type="application/json",
-                        )
-                        # Vertex AI synchronous call, wrap in thread
-                        response = await asyncio.to_thread(
-                            client.generate_content,
-                            contents=[image_part, prompt],
-                            generation_config=generation_config,
-                        )
-                except TimeoutError:
-                    raise
-                except Exception as e:
-                    error_msg = str(e)
-                    if (
-                        "429" in error_msg
-                        or "quota" in error_msg.lower()
-                        or "rate limit" in error_msg.lower()
-                    ):
-                        raise  # Re-raise rate limit errors to be handled separately
-                    logger.error(f"❌ Gemini API request failed: {error_msg}")
-                    raise RuntimeError(f"API request failed: {error_msg}")
-
-                # Extract JSON from response
-                if not response:
-                    raise ValueError("Invalid response from Gemini API: empty response")
-
-                # Get text from response (should be valid JSON when using structured output)
-                try:
-                    response_text = response.text.strip()
-                except AttributeError:
-                    # Fallback if response structure is different
-                    response_text = str(response).strip()
+            # Extract JSON from response
+            response_text = get_response_text(response)
 
-                if not response_text:
-                    raise ValueError("Empty response from Gemini API")
+            logger.debug("📥 Received response from Gemini (length: %d chars)", len(response_text))
 
+            # Parse and validate JSON using Pydantic
+            try:
+                # Returned as a dict for compatibility with existing code
+                result = await run_parser(parse_frame_response, response_text, timestamp)
+
+                # Per-frame detail stays at DEBUG; batch progress is reported at INFO
                 logger.debug(
-                    f"📥 Received response from Gemini (length: {len(response_text)} chars)"
+                    "✅ Successfully analyzed and validated frame at %.2fs | Event: %s | Players: %d",
+                    timestamp,
+                    result["event"],
+                    len(result["players"]),
                 )
 
-                # Parse and validate JSON using Pydantic
-                try:
-                    # Parse JSON first
-                    json_data = json.loads(response_text)
-
-                    # Ensure timestamp is set (in case schema doesn't enforce it)
-                    json_data["timestamp"] = timestamp
-
-                    # Validate using Pydantic model - this ensures type safety and schema compliance
-                    validated_response = GeminiStructuredResponse.model_validate(json_data)
-
-                    logger.info(
-                        f"✅ Successfully analyzed and validated frame at {timestamp:.2f}s | "
-                        f"Event: {validated_response.event} | Players: {len(validated_response.players)}"
-                    )
+                await store_cached_response(frame_key, result)
+                await record_success()
+                return result
 
-                    # Return as dict for compatibility with existing code
-                    return validated_response.model_dump()
+            except ValidationError as e:
+                # Covers both malformed JSON and schema violations
+                logger.error(f"❌ Pydantic validation error: {str(e)}")
+                # Log first 500 chars for debugging
+                logger.debug("Response text: %.500s...", response_text)
+                raise ValueError(f"Response validation failed: {str(e)}")
 
-                except json.JSONDecodeError as e:
-                    logger.error(f"❌ Invalid JSON in response: {str(e)}")
-                    raise ValueError(f"Invalid JSON response from Gemini: {str(e)}")
-                except Exception as e:
-                    # Pydantic validation error
-                    logger.error(f"❌ Pydantic validation error: {str(e)}")
-                    logger.debug(
-                        f"Response text: {response_text[:500]}..."
-                    )  # Log first 500 chars for debugging
-                    raise ValueError(f"Response validation failed: {str(e)}")
+        except Exception as e:
+            error_message = await back_off_after_error(e, attempt, retries)
+            if error_message is None:
+                continue
+            return get_default_response(timestamp, error_message)
 
-            except TimeoutError:
-                logger.warning(f"⏱️  Request timeout on attempt {attempt + 1}")
-                if attempt < retries - 1:
-                    backoff_time = 2**attempt
-                    logger.debug(f"⏳ Retrying after {backoff_time}s")
-                    await asyncio.sleep(backoff_time)
-                    continue
-                logger.error(f"❌ Request timeout after {retries} attempts")
-                return get_default_response(timestamp, "Request timeout")
+    # Should not reach here, but return default if it does
+    logger.error("❌ Max retries exceeded")
+    return get_default_response(timestamp, "Max retries exceeded")
 
-            except Exception as e:
-                error_msg = str(e)
-                logger.warning(f"⚠️  API error on attempt {attempt + 1}: {error_msg}")
-
-                # Check for 503 Service Unavailable (overloaded)
-                if (
-                    "503" in error_msg
-                    or "UNAVAILABLE" in error_msg
-                    or "overloaded" in error_msg.lower()
-                ):
-                    if attempt < retries - 1:
-                        # Longer backoff for 503 errors (exponential with longer base)
-                        backoff_time = min(30, 5 * (2**attempt))  # Max 30 seconds
-                        logger.warning(
-                            f"🔄 Service overloaded (503), retrying after {backoff_time}s..."
-                        )
-                        await asyncio.sleep(backoff_time)
-                        continue
-                    logger.error("❌ Service unavailable after retries")
-                    raise ServiceUnavailableError(
-                        "Gemini API is currently overloaded. Please try again later."
-                    )
 
-                # Check for quota exhaustion (429 with quota exceeded message)
-                is_quota_exhausted = (
-                    "429" in error_msg
-                    and (
-                        "quota" in error_msg.lower()
-                        or "free_tier" in error_msg.lower()
-                        or "RESOURCE_EXHAUSTED" in error_msg
-                    )
-                    and ("exceeded" in error_msg.lower() or "limit" in error_msg.lower())
-                )
+async def analyze_frames_grouped(
+    group: list[tuple[float, bytes]], retries: int = 3
+) -> list[dict[str, Any]]:
+    """
+    Analyze several frames with a single multi-image Gemini request.
 
-                if is_quota_exhausted:
-                    logger.error("❌ API quota exhausted (daily limit reached)")
-                    logger.error(
-                        "💡 Free tier limit: 20 requests per day. Please upgrade or wait until tomorrow."
-                    )
-                    raise QuotaExhaustedError(
-                        "Gemini API daily quota exhausted. Free tier allows 20 requests per day. "
-                        "Please upgrade your plan or try again tomorrow."
-                    )
+    Frames already in the response cache are not re-sent. API errors get the same retry,
+    backoff and quota handling as analyze_frame. Only a response that doesn't validate
+    falls back to analyzing each frame on its own.
 
-                # Check for rate limit (429 but not quota exhausted - temporary)
-                if "429" in error_msg and not is_quota_exhausted:
-                    if attempt < retries - 1:
-                        # Extract retry delay from error if available
-                        retry_delay = 60
-                        if "retry" in error_msg.lower() and "s" in error_msg:
-                            try:
-                                # Try to extract retry delay from message
-                                delay_match = re.search(r"(\d+(?:\.\d+)?)\s*s", error_msg)
-                                if delay_match:
-                                    retry_delay = min(
-                                        120, int(float(delay_match.group(1)) + 5)
-                                    )  # Add 5s buffer, max 120s
-                            except (ValueError, AttributeError, IndexError):
-                                pass
-                        logger.warning(f"🚫 Rate limit hit, waiting {retry_delay}s before retry")
-                        await asyncio.sleep(retry_delay)
-                        continue
-                    logger.error("❌ Rate limit exceeded after retries")
-                    return get_default_response(
-                        timestamp, "Rate limit exceeded. Please try again later."
-                    )
+    Args:
+        group: List of (timestamp, jpeg_bytes) tuples
+        retries: Number of retry attempts on failure
 
-                # Other errors - exponential backoff
-                if attempt < retries - 1:
-                    backoff_time = 2**attempt
-                    logger.debug(f"⏳ Retrying after {backoff_time}s")
-                    await asyncio.sleep(backoff_time)
-                    continue
-                logger.error(f"❌ API error after {retries} attempts: {error_msg}")
-                return get_default_response(timestamp, f"API error: {error_msg}")
+    Returns:
+        List of analysis results in the same order as group
+    """
+    results: list[dict[str, Any] | None] = []
+    uncached = []  # (index, timestamp, frame_bytes, frame_key)
+    for timestamp, frame_bytes in group:
+        if not frame_bytes:
+            # An empty frame can't be sent; the single-frame path returns its default response
+            results.append(await analyze_frame(frame_bytes, timestamp))
+            continue
+        frame_key = get_frame_key(frame_bytes)
+        cached = await get_cached_response(frame_key, timestamp)
+        if cached is None:
+            uncached.append((len(results), timestamp, frame_bytes, frame_key))
+        results.append(cached)
+
+    if not uncached:
+        return results
+    if len(uncached) == 1:
+        # Nothing to group; the single-frame path handles it
+        index, timestamp, frame_bytes, _ = uncached[0]
+        results[index] = await analyze_frame(frame_bytes, timestamp)
+        return results
+
+    timestamps = [timestamp for _, timestamp, _, _ in uncached]
+    logger.debug("🔍 Analyzing %d frames in one request: %s", len(uncached), timestamps)
+
+    frames = [
+        await shrink_frame(frame_bytes, timestamp) for _, timestamp, frame_bytes, _ in uncached
+    ]
+    prompt = get_batch_analysis_prompt(timestamps)
+    frame_message = get_batch_frame_message(timestamps)
 
-        # Should not reach here, but return default if it does
-        logger.error("❌ Max retries exceeded")
-        return get_default_response(timestamp, "Max retries exceeded")
+    for attempt in range(retries):
+        try:
+            async with limiter, concurrency_slot():
+                response = await generate_analysis(frames, prompt, frame_message)
+            break
+        except Exception as e:
+            if "cached" in str(e).lower():
+                # Cache was evicted server-side; re-create it on the next attempt
+                invalidate_prompt_cache()
+            error_message = await back_off_after_error(e, attempt, retries)
+            if error_message is not None:
+                for index, timestamp, _, _ in uncached:
+                    results[index] = get_default_response(timestamp, error_message)
+                return results
+
+    try:
+        validated = await run_parser(
+            parse_grouped_response, get_response_text(response), timestamps
+        )
+    except (ValidationError, ValueError) as e:
+        logger.warning(
+            f"⚠️  Grouped response for {len(uncached)} frames is invalid, "
+            f"analyzing individually: {str(e)}"
+        )
+        tasks = [
+            asyncio.create_task(analyze_frame(frame_bytes, timestamp))
+            for _, timestamp, frame_bytes, _ in uncached
+        ]
+        try:
+            analyses = await asyncio.gather(*tasks)
+        finally:
+            # Quota exhaustion or an outage in one frame stops its siblings too
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for (index, *_), analysis in zip(uncached, analyses):
+            results[index] = analysis
+        return results
+
+    for (index, timestamp, _, frame_key), result in zip(uncached, validated):
+        await store_cached_response(frame_key, result)
+        results[index] = result
+    await record_success()
+
+    logger.info(
+        f"✅ Successfully analyzed and validated {len(validated)} frames in one request "
+        f"({timestamps[0]:.2f}s-{timestamps[-1]:.2f}s)"
+    )
+    return results
 
 
 def get_default_response(timestamp: float, error_message: str = "") -> dict[str, Any]:
@@ -390,16 +947,81 @@ def get_default_response(timestamp: float, error_message: str = "") -> dict[str,
     }
 
 
-async def analyze_frames_batch(frames: list, progress_callback=None) -> list:
+def group_near_duplicates(frames: list[tuple[float, bytes]]) -> list[list[int]]:
+    """
+    Split frames into runs of consecutive, visually near-identical frames (blocking).
+
+    Each frame is compared with the first frame of the current run, so a slow pan can't
+    drift a run arbitrarily far from the frame that is actually analyzed.
+
+    Args:
+        frames: List of (timestamp, jpeg_bytes) tuples
+
+    Returns:
+        Runs of frame indices, in order; only the first frame of each run needs analysis
+    """
+    if NEAR_DUPLICATE_DISTANCE < 0:
+        return [[index] for index in range(len(frames))]
+
+    runs: list[list[int]] = []
+    run_hash = None
+    for index, (_, frame_bytes) in enumerate(frames):
+        frame_hash = perceptual_hash(frame_bytes) if frame_bytes else None
+        if (
+            runs
+            and frame_hash is not None
+            and run_hash is not None
+            and (frame_hash ^ run_hash).bit_count() <= NEAR_DUPLICATE_DISTANCE
+        ):
+            runs[-1].append(index)
+        else:
+            runs.append([index])
+            run_hash = frame_hash
+    return runs
+
+
+def find_blank_runs(frames: list[tuple[float, bytes]], runs: list[list[int]]) -> list[bool]:
+    """
+    Flag runs whose frames are (nearly) black, e.g. fades and blank intros (blocking).
+
+    Only the first frame of each run is checked; the rest look the same.
+
+    Args:
+        frames: List of (timestamp, jpeg_bytes) tuples
+        runs: Runs of frame indices from group_near_duplicates
+
+    Returns:
+        One flag per run, True if the run is blank
+    """
+    if BLANK_FRAME_LUMA <= 0:
+        return [False] * len(runs)
+
+    flags = []
+    for run in runs:
+        frame_bytes = frames[run[0]][1]
+        luma = mean_luma(frame_bytes) if frame_bytes else None
+        flags.append(luma is not None and luma < BLANK_FRAME_LUMA)
+    return flags
+
+
+async def analyze_frames_batch(
+    frames: list,
+    progress_callback=None,
+    transform: Callable[[dict[str, Any]], Any] | None = None,
+) -> tuple[list, bool]:
     """
     Analyze multiple frames in parallel with rate limiting.
 
     Args:
-        frames: List of (timestamp, base64_frame) tuples
+        frames: List of (timestamp, jpeg_bytes) tuples
         progress_callback: Optional callback function(current, total)
+        transform: Optional function applied to each result dict as it lands, so callers
+            get their own result type without a second pass over the batch
 
     Returns:
-        List of analysis results
+        Tuple of (analysis results, quota_exhausted). Results are in the same order as
+        frames (transformed, if transform is given); if quota ran out, the frames that
+        were not analyzed hold default responses
 
     Raises:
         QuotaExhaustedError: If API quota is exhausted
@@ -407,53 +1029,108 @@ async def analyze_frames_batch(frames: list, progress_callback=None) -> list:
     """
     total = len(frames)
     logger.info(f"🚀 Starting batch analysis of {total} frames")
-    logger.info(f"📊 Rate limit: {semaphore._value} concurrent requests, {rate_limit_delay}s delay")
+    logger.info(
+        f"📊 Rate limit: {_concurrency_limit} concurrent requests (max {max_concurrency}), "
+        f"{limiter.max_rate:.0f} requests per {limiter.time_period:.0f}s"
+    )
 
-    tasks = [
-        (timestamp, frame_base64, analyze_frame(frame_base64, timestamp))
-        for timestamp, frame_base64 in frames
-    ]
+    timestamps = [timestamp for timestamp, _ in frames]
+    runs = await asyncio.to_thread(group_near_duplicates, frames)
+    if len(runs) < total:
+        logger.info(f"♻️  {total - len(runs)} near-duplicate frames will reuse an earlier analysis")
+
+    # Blank frames have nothing to analyze, so they never reach the API
+    blank_flags = await asyncio.to_thread(find_blank_runs, frames, runs)
+    blank_runs = [run for run, blank in zip(runs, blank_flags) if blank]
+    runs = [run for run, blank in zip(runs, blank_flags) if not blank]
+    if blank_runs:
+        logger.info(
+            f"🌑 {sum(len(run) for run in blank_runs)} blank frames will get a default response"
+        )
 
-    results = []
+    # Schedule every group of consecutive runs up front; the limiter and admission
+    # controller bound what is in flight
+    # Each task maps to the runs it analyzes so results land in input order
+    tasks = {}
+    for start in range(0, len(runs), FRAMES_PER_REQUEST):
+        group_runs = runs[start : start + FRAMES_PER_REQUEST]
+        task = asyncio.create_task(analyze_frames_grouped([frames[run[0]] for run in group_runs]))
+        tasks[task] = group_runs
+    # Only the scheduled groups reference frame bytes now, so each group's JPEGs can be
+    # freed as soon as it completes (callers should drop their reference too)
+    del frames
+
+    results: list[Any] = [None] * total
     completed = 0
+
+    def store(index: int, result: dict[str, Any]):
+        results[index] = transform(result) if transform else result
+
+    for run in blank_runs:
+        for index in run:
+            store(index, get_default_response(timestamps[index], "Blank frame"))
+        completed += len(run)
+
     quota_exhausted = False
+    quota_error = None
+    pending = set(tasks)
 
-    for timestamp, _, task in tasks:
-        try:
-            result = await task
-            results.append(result)
-            completed += 1
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
 
-            if completed % 10 == 0 or completed == total:
-                logger.info(
-                    f"📈 Progress: {completed}/{total} frames analyzed ({completed/total*100:.1f}%)"
-                )
+            for task in done:
+                group_runs = tasks[task]
+                try:
+                    group_results = task.result()
+                except QuotaExhaustedError as e:
+                    quota_exhausted = True
+                    quota_error = e
+                    for run in group_runs:
+                        for index in run:
+                            store(index, get_default_response(timestamps[index], str(e)))
+                    continue
+                except ServiceUnavailableError:
+                    logger.error(
+                        f"🛑 Service unavailable after processing {completed}/{total} frames"
+                    )
+                    raise
+
+                previous = completed
+                for run, result in zip(group_runs, group_results):
+                    store(run[0], result)
+                    for index in run[1:]:
+                        store(index, {**result, "timestamp": timestamps[index]})
+                    completed += len(run)
+
+                # Groups complete several frames at once, so log whenever a multiple of 10
+                # is reached or passed rather than only when it is hit exactly
+                if completed // 10 != previous // 10 or completed == total:
+                    logger.info(
+                        f"📈 Progress: {completed}/{total} frames analyzed ({completed/total*100:.1f}%)"
+                    )
 
-            if progress_callback:
-                progress_callback(completed, total)
-        except QuotaExhaustedError as e:
-            logger.error(f"🛑 Quota exhausted after processing {completed}/{total} frames")
-            quota_exhausted = True
-            # Add default responses for remaining frames
-            remaining = total - completed
-            logger.warning(f"⚠️  Adding default responses for {remaining} remaining frames")
-            for i in range(remaining):
-                remaining_timestamp = tasks[completed + i][0]
-                results.append(get_default_response(remaining_timestamp, str(e)))
-            break  # Stop processing immediately
-        except ServiceUnavailableError as e:
-            logger.error(f"🛑 Service unavailable after processing {completed}/{total} frames")
-            # Add default responses for remaining frames
-            remaining = total - completed
-            logger.warning(f"⚠️  Adding default responses for {remaining} remaining frames")
-            for i in range(remaining):
-                remaining_timestamp = tasks[completed + i][0]
-                results.append(get_default_response(remaining_timestamp, str(e)))
-            # Re-raise to be handled at higher level
-            raise
-
-    # Sort results by timestamp to maintain order
-    results.sort(key=lambda x: x.get("timestamp", 0))
+                if progress_callback:
+                    progress_callback(completed, total)
+
+            if quota_exhausted:
+                logger.error(f"🛑 Quota exhausted after processing {completed}/{total} frames")
+                # Add default responses for frames still in flight or waiting
+                remaining = sum(len(run) for task in pending for run in tasks[task])
+                logger.warning(f"⚠️  Adding default responses for {remaining} remaining frames")
+                for task in pending:
+                    for run in tasks[task]:
+                        for index in run:
+                            store(index, get_default_response(timestamps[index], str(quota_error)))
+                break  # Stop processing immediately
+    finally:
+        # Cancel anything still scheduled (quota exhausted, service unavailable, or error)
+        for task in pending:
+            task.cancel()
+        # Let cancelled tasks unwind so their rate tokens and concurrency slots are released
+        # before we return, and their exceptions are retrieved instead of logged at shutdown
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
 
     if quota_exhausted:
         logger.warning(
@@ -466,4 +1143,4 @@ async def analyze_frames_batch(frames: list, progress_callback=None) -> list:
         # The results already contain default responses for failed frames
 
     logger.info(f"✨ Batch analysis complete: {len(results)} frames analyzed")
-    return results
+    return results, quota_exhausted
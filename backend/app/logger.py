@@ -3,13 +3,21 @@ Centralized logging configuration with pretty, spacious formatting.
 """
 
 import logging
+import os
 
+from dotenv import load_dotenv
 from rich.console import Console
 from rich.logging import RichHandler
 from rich.traceback import install
 
+load_dotenv()
+
+# Rendering every frame's locals is slow and dumps whole frame buffers into the log, so it is
+# opt-in for local debugging
+VERBOSE_TRACEBACKS = os.getenv("LOG_VERBOSE_TRACEBACKS", "").lower() in ("1", "true", "yes")
+
 # Install rich traceback handler for better error display
-install(show_locals=True)
+install(show_locals=VERBOSE_TRACEBACKS, max_frames=10)
 
 # Create console for rich output
 console = Console()
@@ -23,11 +31,11 @@ logging.basicConfig(
         RichHandler(
             console=console,
             rich_tracebacks=True,
-            show_path=True,
+            show_path=False,
             markup=True,
             show_time=True,
             show_level=True,
-            tracebacks_show_locals=True,
+            tracebacks_show_locals=VERBOSE_TRACEBACKS,
         )
     ],
 )
@@ -1,11 +1,16 @@
+import asyncio
 import io
 import os
 import sys
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import BinaryIO
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import ORJSONResponse, Response
 
 from app.gemini_analyzer import ServiceUnavailableError, analyze_frames_batch
 from app.logger import get_logger
@@ -13,7 +18,7 @@ from app.models import (
     AnalysisConfig,
     AnalysisResponse,
     FrameAnalysis,
-    GeminiStructuredResponse,
+    transform_gemini_batch,
     transform_gemini_response,
 )
 from app.openrouter_analyzer import (
@@ -24,24 +29,72 @@ from app.openrouter_analyzer import (
 )
 from app.openrouter_analyzer import (
     analyze_video_multimodal,
+    close_http_client,
 )
-from app.video_processor import extract_frames
-from app.video_timestamp_overlay import add_timestamp_overlay
+from app.video_processor import extract_frames_from_file
+from app.video_timestamp_overlay import add_timestamp_overlay_from_file
 
 load_dotenv()
 
 # Fix Windows console encoding to handle emoji characters
+# (reconfigure changes the existing streams in place, so re-importing doesn't stack wrappers)
 if sys.platform == "win32":
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.reconfigure(encoding="utf-8", errors="replace")
+        except AttributeError:
+            pass  # Replaced by a stream without reconfigure (e.g. under a test runner)
 
 logger = get_logger("main")
 
-app = FastAPI(title="Football Video Analysis API")
+# Uploads are copied to disk in chunks of this size rather than read into memory whole
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Request limits
+MAX_VIDEOS = 6
+MAX_FRAME_INTERVAL = 10  # seconds
+MAX_DURATION = 60  # seconds
+# Per-video upload size in MB (multimodal videos are sent inline, so they are kept smaller)
+MAX_VIDEO_SIZE_MB = {"frame": 100, "multimodal": 50}
+OVERLAY_MAX_VIDEO_SIZE_MB = 100
+# Largest request body worth receiving: every video at the largest limit, plus 1 MB of form data
+MAX_REQUEST_BYTES = (
+    (MAX_VIDEOS * max(*MAX_VIDEO_SIZE_MB.values(), OVERLAY_MAX_VIDEO_SIZE_MB) + 1) * 1024 * 1024
+)
+
+# Multimodal mode sends each whole video inline; cap how many are loaded and in flight at once
+MULTIMODAL_MAX_CONCURRENT = max(1, int(os.getenv("MULTIMODAL_MAX_CONCURRENT", "3")))
+multimodal_semaphore = asyncio.Semaphore(MULTIMODAL_MAX_CONCURRENT)
+
+# JSON responses are encoded with orjson rather than the stdlib json module
+app = FastAPI(title="Football Video Analysis API", default_response_class=ORJSONResponse)
 
 logger.info("🚀 Starting Football Video Analysis API")
 
-# CORS middleware
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Release pooled HTTP connections."""
+    await close_http_client()
+
+
+@app.middleware("http")
+async def reject_oversized_requests(request: Request, call_next):
+    """Reject requests whose declared body size can't fit the upload limits before reading it."""
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_REQUEST_BYTES:
+        logger.warning(
+            f"❌ Request body too large: {int(content_length) / 1024 / 1024:.2f} MB "
+            f"(max {MAX_REQUEST_BYTES // 1024 // 1024} MB)"
+        )
+        return ORJSONResponse(
+            status_code=413,
+            content={"detail": f"Request too large (over {MAX_REQUEST_BYTES // 1024 // 1024}MB)"},
+        )
+    return await call_next(request)
+
+
+# CORS middleware (added last so it also wraps the responses above)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # In production, specify actual frontend URL
@@ -51,6 +104,141 @@ app.add_middleware(
 )
 
 
+def spool_upload(upload: BinaryIO, max_bytes: int) -> tuple[str, int]:
+    """
+    Copy an uploaded file to a temporary file on disk in fixed-size chunks (blocking).
+
+    Copying stops as soon as the upload exceeds max_bytes, so an oversized file is never
+    written out in full.
+
+    Args:
+        upload: Uploaded file object, positioned at the start
+        max_bytes: Size limit in bytes
+
+    Returns:
+        Tuple of (temporary file path, bytes read); bytes read exceeds max_bytes if the
+        upload is over the limit
+    """
+    size = 0
+    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4")
+    try:
+        with tmp_file:
+            while chunk := upload.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    break
+                tmp_file.write(chunk)
+    except Exception:
+        os.unlink(tmp_file.name)
+        raise
+    return tmp_file.name, size
+
+
+async def spool_video(
+    idx: int, video: UploadFile, max_size_mb: int, limit_detail: str, temp_paths: list[str]
+) -> tuple[str, str]:
+    """
+    Spool one uploaded video to a temporary file and validate its size.
+
+    Args:
+        idx: Position of the video in the upload
+        video: Uploaded video
+        max_size_mb: Size limit in MB
+        limit_detail: Sentence describing the limit, appended to the 413 error detail
+        temp_paths: The spooled file's path is appended here so the caller can clean it up
+
+    Returns:
+        Tuple of (filename, temporary file path)
+
+    Raises:
+        HTTPException: If the video cannot be read, is empty, or is too large
+    """
+    try:
+        if not video.filename:
+            logger.warning(f"⚠️  Video {idx + 1} has no filename")
+            video.filename = f"video_{idx + 1}.mp4"
+
+        # Reject on the size reported by the multipart parser before copying anything
+        if video.size is not None and video.size > max_size_mb * 1024 * 1024:
+            logger.warning(f"❌ Video {video.filename} too large: over {max_size_mb}MB")
+            raise HTTPException(
+                status_code=413,
+                detail=f"Video {video.filename} is too large (over {max_size_mb}MB). {limit_detail}",
+            )
+
+        # Copy the upload to a temporary file in chunks instead of reading it into memory
+        try:
+            video_path, file_size = await asyncio.to_thread(
+                spool_upload, video.file, max_size_mb * 1024 * 1024
+            )
+        except Exception as e:
+            logger.error(f"❌ Failed to read video {video.filename}: {str(e)}")
+            raise HTTPException(
+                status_code=400, detail=f"Failed to read video {video.filename}: {str(e)}"
+            )
+        temp_paths.append(video_path)
+
+        if file_size == 0:
+            logger.warning(f"❌ Video {video.filename} is empty")
+            raise HTTPException(status_code=400, detail=f"Video {video.filename} is empty")
+
+        if file_size > max_size_mb * 1024 * 1024:
+            logger.warning(f"❌ Video {video.filename} too large: over {max_size_mb}MB")
+            raise HTTPException(
+                status_code=413,
+                detail=f"Video {video.filename} is too large (over {max_size_mb}MB). {limit_detail}",
+            )
+
+        logger.debug(
+            "✅ Spooled video %s to disk (%.2f MB)", video.filename, file_size / 1024 / 1024
+        )
+        return video.filename, video_path
+
+    except HTTPException:
+        raise  # Re-raise HTTP exceptions
+    except Exception as e:
+        logger.error(f"❌ Error processing video {video.filename}: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=400, detail=f"Error processing video {video.filename}: {str(e)}"
+        )
+
+
+async def spool_videos(
+    videos: list[UploadFile], max_size_mb: int, limit_detail: str, temp_paths: list[str]
+) -> list[tuple[str, str]]:
+    """
+    Spool all uploaded videos to temporary files concurrently (see spool_video).
+
+    Returns:
+        List of (filename, temporary file path) tuples, in upload order
+
+    Raises:
+        HTTPException: For the first video that fails validation
+    """
+    # Let every copy finish before raising, so each spooled file is in temp_paths by the time
+    # the caller cleans up
+    outcomes = await asyncio.gather(
+        *(
+            spool_video(idx, video, max_size_mb, limit_detail, temp_paths)
+            for idx, video in enumerate(videos)
+        ),
+        return_exceptions=True,
+    )
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            raise outcome
+    return outcomes
+
+
+def remove_temp_files(paths: list[str]):
+    """Delete spooled upload files, logging rather than raising on failure."""
+    for path in paths:
+        try:
+            os.unlink(path)
+        except OSError as e:
+            logger.warning(f"⚠️  Failed to delete temporary file {path}: {str(e)}")
+
+
 @app.get("/")
 async def root():
     logger.info("📡 Root endpoint accessed")
@@ -63,10 +251,150 @@ async def health():
     return {"status": "healthy"}
 
 
+def build_zip_archive(files: list[tuple[str, bytes]]) -> bytes:
+    """
+    Pack files into a ZIP archive in memory.
+
+    Entries are stored uncompressed since the videos are already compressed.
+
+    Args:
+        files: List of (archive_name, file_bytes) tuples
+
+    Returns:
+        ZIP archive bytes
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+        for name, data in files:
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def validate_request(
+    video_count: int,
+    max_duration: float | None,
+    frame_interval: float | None = None,
+    analysis_mode: str | None = None,
+):
+    """
+    Validate the request parameters shared by the upload endpoints.
+
+    Args:
+        video_count: Number of uploaded videos
+        max_duration: Maximum duration to process in seconds (None to skip the check)
+        frame_interval: Frame extraction interval in seconds (None to skip the check)
+        analysis_mode: Requested analysis mode (None to skip the check)
+
+    Raises:
+        HTTPException: 400 if any parameter is out of range
+    """
+    if video_count > MAX_VIDEOS:
+        logger.warning(f"❌ Too many videos: {video_count} (max {MAX_VIDEOS})")
+        raise HTTPException(status_code=400, detail=f"Maximum {MAX_VIDEOS} videos allowed")
+
+    if video_count == 0:
+        logger.warning("❌ No videos provided")
+        raise HTTPException(status_code=400, detail="At least one video is required")
+
+    # FastAPI has already coerced the form fields to float, so only ranges are checked
+    if frame_interval is not None:
+        if frame_interval <= 0:
+            logger.warning(f"❌ Invalid frame_interval: {frame_interval}")
+            raise HTTPException(
+                status_code=400,
+                detail=f"frame_interval must be a positive number, got {frame_interval}",
+            )
+        if frame_interval > MAX_FRAME_INTERVAL:
+            logger.warning(f"❌ Frame interval too large: {frame_interval}")
+            raise HTTPException(
+                status_code=400,
+                detail=f"frame_interval cannot exceed {MAX_FRAME_INTERVAL} seconds",
+            )
+
+    if max_duration is not None:
+        if max_duration <= 0:
+            logger.warning(f"❌ Invalid max_duration: {max_duration}")
+            raise HTTPException(
+                status_code=400,
+                detail=f"max_duration must be a positive number, got {max_duration}",
+            )
+        if max_duration > MAX_DURATION:
+            logger.warning(f"❌ Max duration too large: {max_duration}")
+            raise HTTPException(
+                status_code=400, detail=f"max_duration cannot exceed {MAX_DURATION} seconds"
+            )
+
+    if analysis_mode is not None and analysis_mode not in MAX_VIDEO_SIZE_MB:
+        logger.warning(f"❌ Invalid analysis_mode: {analysis_mode}")
+        raise HTTPException(
+            status_code=400,
+            detail=f"analysis_mode must be 'frame' or 'multimodal', got {analysis_mode}",
+        )
+
+
+def to_frame_analysis(gemini_result: dict) -> FrameAnalysis:
+    """Transform an already-validated Gemini result dict to FrameAnalysis, defaulting on error."""
+    try:
+        # Results are model_dump()s (or default responses) from the analyzer; skip re-validation
+        if not isinstance(gemini_result, dict):
+            raise TypeError(f"Expected a result dict, got {type(gemini_result).__name__}")
+        return transform_gemini_response(gemini_result)
+    except Exception as e:
+        logger.error(f"❌ Error transforming result: {str(e)}", exc_info=True)
+        # Create a default frame analysis for this timestamp
+        return FrameAnalysis(
+            timestamp=(
+                gemini_result.get("timestamp", 0.0) if isinstance(gemini_result, dict) else 0.0
+            ),
+            event="unknown",
+            ball_position="Not visible",
+            players_detected=0,
+            team_a_shape="Unknown",
+            team_b_shape="Unknown",
+            tactical_notes=f"Error transforming response: {str(e)}",
+        )
+
+
+async def analyze_video_file(
+    video_idx: int, filename: str, video_path: str, video_count: int
+) -> list[FrameAnalysis]:
+    """
+    Analyze one spooled video with OpenRouter multimodal analysis.
+
+    At most MULTIMODAL_MAX_CONCURRENT videos are loaded and in flight at once, which bounds
+    memory as each video is sent inline.
+
+    Args:
+        video_idx: Position of the video in the upload (for logging)
+        filename: Original filename (for logging)
+        video_path: Path of the spooled video file
+        video_count: Number of videos in the upload (for logging)
+
+    Returns:
+        List of FrameAnalysis, one per analyzed timestamp
+    """
+    async with multimodal_semaphore:
+        logger.info(f"📹 Processing video {video_idx + 1}/{video_count}: {filename}")
+        # The API takes the whole video inline, so load it only once a slot is free
+        video_bytes = await asyncio.to_thread(Path(video_path).read_bytes)
+        logger.debug("📊 Video %d size: %.2f MB", video_idx + 1, len(video_bytes) / 1024 / 1024)
+
+        # Analyze entire video (returns list of analyses at different timestamps)
+        results = await analyze_video_multimodal(video_bytes)
+        del video_bytes
+
+    # Transform each result to FrameAnalysis
+    frame_analyses = transform_gemini_batch(results)
+    logger.info(
+        f"✅ Video {video_idx + 1}: Multimodal analysis complete ({len(results)} timestamp analyses)"
+    )
+    return frame_analyses
+
+
 async def process_videos(
-    video_data: list[tuple], config: AnalysisConfig
+    video_data: list[tuple[str, str]], config: AnalysisConfig
 ) -> tuple[list[FrameAnalysis], bool]:
-    """Process videos and analyze frames. Returns list of FrameAnalysis."""
+    """Process videos, given as (filename, path) pairs, and analyze frames. Returns list of FrameAnalysis."""
     logger.info(
         f"⚙️  Configuration: mode={config.analysis_mode}, frame_interval={config.frame_interval}s, max_duration={config.max_duration}s"
     )
@@ -83,30 +411,19 @@ async def process_videos(
 
             frame_analyses = []
 
-            for video_idx, (filename, video_bytes) in enumerate(video_data):
-                try:
-                    logger.info(
-                        f"📹 Processing video {video_idx + 1}/{len(video_data)}: {filename}"
-                    )
-                    logger.debug(
-                        f"📊 Video {video_idx + 1} size: {len(video_bytes) / 1024 / 1024:.2f} MB"
-                    )
-
-                    # Analyze entire video (returns list of analyses at different timestamps)
-                    results = await analyze_video_multimodal(video_bytes)
-
-                    # Transform each result to FrameAnalysis
-                    for result in results:
-                        validated = GeminiStructuredResponse.model_validate(result)
-                        frame_analysis = transform_gemini_response(validated)
-                        frame_analyses.append(frame_analysis)
-
-                    logger.info(
-                        f"✅ Video {video_idx + 1}: Multimodal analysis complete ({len(results)} timestamp analyses)"
-                    )
+            # Analyze all videos concurrently (bounded by MULTIMODAL_MAX_CONCURRENT), then
+            # handle each outcome in upload order
+            outcomes = await asyncio.gather(
+                *(
+                    analyze_video_file(video_idx, filename, video_path, len(video_data))
+                    for video_idx, (filename, video_path) in enumerate(video_data)
+                ),
+                return_exceptions=True,
+            )
 
-                except OpenRouterQuotaExhaustedError as e:
-                    logger.error(f"❌ OpenRouter quota exhausted: {str(e)}")
+            for video_idx, outcome in enumerate(outcomes):
+                if isinstance(outcome, OpenRouterQuotaExhaustedError):
+                    logger.error(f"❌ OpenRouter quota exhausted: {str(outcome)}")
                     quota_exhausted = True
                     # Add default response for this video
                     frame_analyses.append(
@@ -117,31 +434,18 @@ async def process_videos(
                             players_detected=0,
                             team_a_shape="Unknown",
                             team_b_shape="Unknown",
-                            tactical_notes=f"Quota exhausted: {str(e)}",
+                            tactical_notes=f"Quota exhausted: {str(outcome)}",
                         )
                     )
-                    break  # Stop processing
 
-                except OpenRouterServiceUnavailableError as e:
-                    logger.error(f"❌ OpenRouter service unavailable: {str(e)}")
-                    quota_exhausted = True
-                    # Add default response
-                    frame_analyses.append(
-                        FrameAnalysis(
-                            timestamp=0.0,
-                            event="unknown",
-                            ball_position="Not visible",
-                            players_detected=0,
-                            team_a_shape="Unknown",
-                            team_b_shape="Unknown",
-                            tactical_notes=f"Service unavailable: {str(e)}",
-                        )
-                    )
-                    raise  # Re-raise to be caught by outer handler
+                elif isinstance(outcome, OpenRouterServiceUnavailableError):
+                    logger.error(f"❌ OpenRouter service unavailable: {str(outcome)}")
+                    raise outcome  # Re-raise to be caught by outer handler
 
-                except Exception as e:
+                elif isinstance(outcome, BaseException):
                     logger.error(
-                        f"❌ Error analyzing video {video_idx + 1}: {str(e)}", exc_info=True
+                        f"❌ Error analyzing video {video_idx + 1}: {str(outcome)}",
+                        exc_info=outcome,
                     )
                     # Add default response
                     frame_analyses.append(
@@ -152,10 +456,12 @@ async def process_videos(
                             players_detected=0,
                             team_a_shape="Unknown",
                             team_b_shape="Unknown",
-                            tactical_notes=f"Analysis failed: {str(e)}",
+                            tactical_notes=f"Analysis failed: {str(outcome)}",
                         )
                     )
-                    continue
+
+                else:
+                    frame_analyses.extend(outcome)
 
             logger.info(f"✅ Multimodal analysis complete: {len(frame_analyses)} videos analyzed")
             return frame_analyses, quota_exhausted
@@ -169,37 +475,40 @@ async def process_videos(
 
             logger.info("📥 Step 1: Extracting frames from videos...")
 
-            # Step 1: Extract frames from all videos
-            for video_idx, (filename, video_bytes) in enumerate(video_data):
-                try:
-                    logger.info(
-                        f"📹 Processing video {video_idx + 1}/{len(video_data)}: {filename}"
-                    )
-                    logger.debug(
-                        f"📊 Video {video_idx + 1} size: {len(video_bytes) / 1024 / 1024:.2f} MB"
-                    )
-
-                    # Extract frames with configured interval
-                    frames = extract_frames(
-                        video_bytes,
+            # Step 1: Extract frames from all videos in parallel worker threads (OpenCV releases
+            # the GIL while decoding, and the event loop stays free for other requests)
+            for video_idx, (filename, _) in enumerate(video_data):
+                logger.info(f"📹 Processing video {video_idx + 1}/{len(video_data)}: {filename}")
+            extractions = await asyncio.gather(
+                *(
+                    asyncio.to_thread(
+                        extract_frames_from_file,
+                        video_path,
                         fps_interval=config.frame_interval,
                         max_duration=config.max_duration,
                     )
-                    all_frames_data.extend(frames)
-                    total_frames += len(frames)
+                    for _, video_path in video_data
+                ),
+                return_exceptions=True,
+            )
 
-                    logger.info(f"✅ Video {video_idx + 1}: Extracted {len(frames)} frames")
-                except ValueError as e:
+            for video_idx, frames in enumerate(extractions):
+                if isinstance(frames, ValueError):
                     # Video validation error (e.g., too long)
-                    logger.error(f"❌ Video {video_idx + 1} validation error: {str(e)}")
+                    logger.error(f"❌ Video {video_idx + 1} validation error: {str(frames)}")
                     continue
-                except Exception as e:
+                if isinstance(frames, BaseException):
                     logger.error(
-                        f"❌ Error extracting frames from video {video_idx + 1}: {str(e)}",
-                        exc_info=True,
+                        f"❌ Error extracting frames from video {video_idx + 1}: {str(frames)}",
+                        exc_info=frames,
                     )
                     continue
 
+                all_frames_data.extend(frames)
+                total_frames += len(frames)
+                logger.info(f"✅ Video {video_idx + 1}: Extracted {len(frames)} frames")
+            del extractions
+
             if total_frames == 0:
                 logger.error("❌ No frames extracted from any video")
                 raise ValueError("No frames extracted from videos")
@@ -207,73 +516,28 @@ async def process_videos(
             logger.info(f"📊 Total frames extracted: {total_frames}")
             logger.info("🤖 Step 2: Analyzing frames with Gemini AI...")
 
-            # Step 2: Analyze frames with Gemini
+            # Step 2: Analyze frames with Gemini, transforming each result to FrameAnalysis
+            # as it completes
             try:
-                gemini_results = await analyze_frames_batch(all_frames_data, None)
+                # Drop our reference to the frames so they are freed as each group completes
+                analysis = analyze_frames_batch(all_frames_data, None, transform=to_frame_analysis)
+                del all_frames_data
+                frame_analyses, quota_exhausted = await analysis
             except ServiceUnavailableError as e:
                 logger.error(f"❌ {str(e)}")
                 raise RuntimeError(str(e))
-            # Note: QuotaExhaustedError is now handled by returning partial results
-
-            # Check if quota was exhausted (indicated by default responses with quota error messages)
-            quota_exhausted = any(
-                "quota" in result.get("tactical_notes", "").lower()
-                and "exhausted" in result.get("tactical_notes", "").lower()
-                for result in gemini_results
-            )
-
-            if quota_exhausted:
-                successful_frames = sum(
-                    1
-                    for result in gemini_results
-                    if "quota" not in result.get("tactical_notes", "").lower()
-                )
-                logger.warning(
-                    f"⚠️  Quota exhausted: {successful_frames}/{len(gemini_results)} frames successfully analyzed"
-                )
-
-            logger.info(f"✅ Step 2 complete: Analyzed {len(gemini_results)} frames")
-            logger.info("🔄 Step 3: Transforming results...")
+            # Note: QuotaExhaustedError is handled by returning partial results with the
+            # quota_exhausted flag set (the batch logs how many frames were analyzed)
 
-            # Step 3: Transform results to FrameAnalysis
-            # Note: gemini_results are now validated Pydantic model dicts
-            frame_analyses = []
-            for gemini_result in gemini_results:
-                try:
-                    # Validate the result is a dict (from model_dump())
-                    if isinstance(gemini_result, dict):
-                        # Re-validate with Pydantic to ensure structure
-                        validated = GeminiStructuredResponse.model_validate(gemini_result)
-                        frame_analysis = transform_gemini_response(validated)
-                    else:
-                        # Fallback: try to convert
-                        validated = GeminiStructuredResponse.model_validate(gemini_result)
-                        frame_analysis = transform_gemini_response(validated)
-                    frame_analyses.append(frame_analysis)
-                except Exception as e:
-                    logger.error(f"❌ Error transforming result: {str(e)}", exc_info=True)
-                    # Create a default frame analysis for this timestamp
-                    frame_analyses.append(
-                        FrameAnalysis(
-                            timestamp=(
-                                gemini_result.get("timestamp", 0.0)
-                                if isinstance(gemini_result, dict)
-                                else 0.0
-                            ),
-                            event="unknown",
-                            ball_position="Not visible",
-                            players_detected=0,
-                            team_a_shape="Unknown",
-                            team_b_shape="Unknown",
-                            tactical_notes=f"Error transforming response: {str(e)}",
-                        )
-                    )
-
-            logger.info(f"✅ Step 3 complete: Transformed {len(frame_analyses)} frame analyses")
+            logger.info(f"✅ Step 2 complete: Analyzed {len(frame_analyses)} frames")
             logger.info(f"✨ Analysis complete: {len(frame_analyses)} frames analyzed")
 
             return frame_analyses, quota_exhausted
 
+    except (ValueError, RuntimeError, OpenRouterServiceUnavailableError) as e:
+        # Expected failures (no frames extracted, service unavailable) don't need a traceback
+        logger.error(f"❌ Analysis failed: {str(e)}")
+        raise
     except Exception as e:
         logger.error(f"❌ Analysis failed: {str(e)}", exc_info=True)
         raise
@@ -286,51 +550,20 @@ async def analyze_videos(
     max_duration: float = Form(10.0),
     analysis_mode: str = Form("frame"),
 ):
-    """Analyze uploaded videos. Max 6 videos, each up to max_duration seconds."""
+    """
+    Analyze uploaded videos. Max 6 videos, each up to max_duration seconds.
+
+    Videos over the mode's size limit (100MB frame, 50MB multimodal) are rejected with 413
+    before they are copied to disk.
+    """
+    temp_paths: list[str] = []
     try:
         logger.info(f"📥 Received analysis request: {len(videos)} video(s)")
         logger.info(
             f"⚙️  Request config: frame_interval={frame_interval}s, max_duration={max_duration}s, analysis_mode={analysis_mode}"
         )
 
-        if len(videos) > 6:
-            logger.warning(f"❌ Too many videos: {len(videos)} (max 6)")
-            raise HTTPException(status_code=400, detail="Maximum 6 videos allowed")
-
-        if len(videos) == 0:
-            logger.warning("❌ No videos provided")
-            raise HTTPException(status_code=400, detail="At least one video is required")
-
-        # Validate configuration
-        if not isinstance(frame_interval, (int, float)) or frame_interval <= 0:
-            logger.warning(f"❌ Invalid frame_interval: {frame_interval}")
-            raise HTTPException(
-                status_code=400,
-                detail=f"frame_interval must be a positive number, got {frame_interval}",
-            )
-
-        if frame_interval > 10:
-            logger.warning(f"❌ Frame interval too large: {frame_interval}")
-            raise HTTPException(status_code=400, detail="frame_interval cannot exceed 10 seconds")
-
-        if not isinstance(max_duration, (int, float)) or max_duration <= 0:
-            logger.warning(f"❌ Invalid max_duration: {max_duration}")
-            raise HTTPException(
-                status_code=400,
-                detail=f"max_duration must be a positive number, got {max_duration}",
-            )
-
-        if max_duration > 60:
-            logger.warning(f"❌ Max duration too large: {max_duration}")
-            raise HTTPException(status_code=400, detail="max_duration cannot exceed 60 seconds")
-
-        # Validate analysis_mode
-        if analysis_mode not in ["frame", "multimodal"]:
-            logger.warning(f"❌ Invalid analysis_mode: {analysis_mode}")
-            raise HTTPException(
-                status_code=400,
-                detail=f"analysis_mode must be 'frame' or 'multimodal', got {analysis_mode}",
-            )
+        validate_request(len(videos), max_duration, frame_interval, analysis_mode)
 
         config = AnalysisConfig(
             frame_interval=frame_interval,
@@ -338,56 +571,17 @@ async def analyze_videos(
             analysis_mode=analysis_mode,
         )
 
-        # Read all video files into memory before starting background task
-        video_data = []
-        for idx, video in enumerate(videos):
-            try:
-                if not video.filename:
-                    logger.warning(f"⚠️  Video {idx + 1} has no filename")
-                    video.filename = f"video_{idx + 1}.mp4"
-
-                # Read the file content into memory
-                try:
-                    content = await video.read()
-                except Exception as e:
-                    logger.error(f"❌ Failed to read video {video.filename}: {str(e)}")
-                    raise HTTPException(
-                        status_code=400, detail=f"Failed to read video {video.filename}: {str(e)}"
-                    )
-
-                if not content or len(content) == 0:
-                    logger.warning(f"❌ Video {video.filename} is empty")
-                    raise HTTPException(status_code=400, detail=f"Video {video.filename} is empty")
-
-                file_size_mb = len(content) / 1024 / 1024
-                logger.debug(f"📊 Video {video.filename}: {file_size_mb:.2f} MB")
-
-                # Different size limits for different modes
-                max_file_size = (
-                    50 * 1024 * 1024 if analysis_mode == "multimodal" else 100 * 1024 * 1024
-                )
-                max_size_mb = 50 if analysis_mode == "multimodal" else 100
-
-                if len(content) > max_file_size:
-                    logger.warning(
-                        f"❌ Video {video.filename} too large: {file_size_mb:.2f} MB (max {max_size_mb}MB for {analysis_mode} mode)"
-                    )
-                    raise HTTPException(
-                        status_code=413,
-                        detail=f"Video {video.filename} is too large ({file_size_mb:.1f}MB). Maximum size for {analysis_mode} mode is {max_size_mb}MB",
-                    )
-
-                # Store filename and bytes
-                video_data.append((video.filename, content))
-                logger.debug(f"✅ Loaded video {video.filename} into memory")
+        # Different size limits for different modes
+        max_size_mb = MAX_VIDEO_SIZE_MB[analysis_mode]
 
-            except HTTPException:
-                raise  # Re-raise HTTP exceptions
-            except Exception as e:
-                logger.error(f"❌ Error processing video {video.filename}: {str(e)}", exc_info=True)
-                raise HTTPException(
-                    status_code=400, detail=f"Error processing video {video.filename}: {str(e)}"
-                )
+        # Spool all video files to disk concurrently before processing (frames are extracted
+        # from the files)
+        video_data = await spool_videos(
+            videos,
+            max_size_mb,
+            f"Maximum size for {analysis_mode} mode is {max_size_mb}MB",
+            temp_paths,
+        )
 
         if len(video_data) == 0:
             logger.error("❌ No valid videos to process")
@@ -431,6 +625,8 @@ async def analyze_videos(
     except Exception as e:
         logger.error(f"❌ Unexpected error in analyze_videos: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    finally:
+        remove_temp_files(temp_paths)
 
 
 @app.post("/api/video/timestamp-overlay")
@@ -438,7 +634,13 @@ async def timestamp_overlay_videos(
     videos: list[UploadFile] = File(...),
     max_duration: float = Form(None),
 ):
-    """Add timestamp overlay to uploaded videos. Max 6 videos, each up to max_duration seconds (optional)."""
+    """
+    Add timestamp overlay to uploaded videos. Max 6 videos, each up to max_duration seconds (optional).
+
+    A single video is returned as a video file; multiple videos are returned as one ZIP archive.
+    Videos over 100MB are rejected with 413 before they are copied to disk.
+    """
+    temp_paths: list[str] = []
     try:
         logger.info(f"📥 Received timestamp overlay request: {len(videos)} video(s)")
         if max_duration:
@@ -446,71 +648,15 @@ async def timestamp_overlay_videos(
         else:
             logger.info("⚙️  Request config: max_duration=None (process full video)")
 
-        if len(videos) > 6:
-            logger.warning(f"❌ Too many videos: {len(videos)} (max 6)")
-            raise HTTPException(status_code=400, detail="Maximum 6 videos allowed")
-
-        if len(videos) == 0:
-            logger.warning("❌ No videos provided")
-            raise HTTPException(status_code=400, detail="At least one video is required")
-
-        # Validate max_duration if provided
-        if max_duration is not None:
-            if not isinstance(max_duration, (int, float)) or max_duration <= 0:
-                logger.warning(f"❌ Invalid max_duration: {max_duration}")
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"max_duration must be a positive number, got {max_duration}",
-                )
+        validate_request(len(videos), max_duration)
 
-            if max_duration > 60:
-                logger.warning(f"❌ Max duration too large: {max_duration}")
-                raise HTTPException(status_code=400, detail="max_duration cannot exceed 60 seconds")
-
-        # Read all video files into memory
-        video_data = []
-        for idx, video in enumerate(videos):
-            try:
-                if not video.filename:
-                    logger.warning(f"⚠️  Video {idx + 1} has no filename")
-                    video.filename = f"video_{idx + 1}.mp4"
-
-                # Read the file content into memory
-                try:
-                    content = await video.read()
-                except Exception as e:
-                    logger.error(f"❌ Failed to read video {video.filename}: {str(e)}")
-                    raise HTTPException(
-                        status_code=400, detail=f"Failed to read video {video.filename}: {str(e)}"
-                    )
-
-                if not content or len(content) == 0:
-                    logger.warning(f"❌ Video {video.filename} is empty")
-                    raise HTTPException(status_code=400, detail=f"Video {video.filename} is empty")
-
-                file_size_mb = len(content) / 1024 / 1024
-                logger.debug(f"📊 Video {video.filename}: {file_size_mb:.2f} MB")
-
-                if len(content) > 100 * 1024 * 1024:  # 100MB limit
-                    logger.warning(
-                        f"❌ Video {video.filename} too large: {file_size_mb:.2f} MB (max 100MB)"
-                    )
-                    raise HTTPException(
-                        status_code=413,
-                        detail=f"Video {video.filename} is too large ({file_size_mb:.1f}MB). Maximum size is 100MB",
-                    )
-
-                # Store filename and bytes
-                video_data.append((video.filename, content))
-                logger.debug(f"✅ Loaded video {video.filename} into memory")
-
-            except HTTPException:
-                raise  # Re-raise HTTP exceptions
-            except Exception as e:
-                logger.error(f"❌ Error processing video {video.filename}: {str(e)}", exc_info=True)
-                raise HTTPException(
-                    status_code=400, detail=f"Error processing video {video.filename}: {str(e)}"
-                )
+        # Spool all video files to disk concurrently
+        video_data = await spool_videos(
+            videos,
+            OVERLAY_MAX_VIDEO_SIZE_MB,
+            f"Maximum size is {OVERLAY_MAX_VIDEO_SIZE_MB}MB",
+            temp_paths,
+        )
 
         if len(video_data) == 0:
             logger.error("❌ No valid videos to process")
@@ -518,40 +664,71 @@ async def timestamp_overlay_videos(
 
         # Process videos and return as downloadable files
         try:
-            logger.info("🚀 Starting timestamp overlay processing...")
-
-            # For multiple videos, we'll return them as a zip or individual files
-            # For simplicity, process first video and return it
-            # In production, you might want to return a zip file for multiple videos
-            if len(video_data) > 1:
-                logger.warning(
-                    f"⚠️  Multiple videos provided ({len(video_data)}). Processing first video only."
-                )
-
-            filename, video_bytes = video_data[0]
-
-            # Process video with timestamp overlay
-            processed_video_bytes = add_timestamp_overlay(video_bytes, max_duration=max_duration)
-
             logger.info(
-                f"✅ Timestamp overlay complete: {len(processed_video_bytes) / 1024 / 1024:.2f} MB"
+                f"🚀 Starting timestamp overlay processing for {len(video_data)} video(s)..."
             )
 
-            # Generate output filename
+            # Each overlay decodes and re-encodes in OpenCV, so run them in parallel worker threads.
+            # Wait for all of them before failing so no thread is still reading a spooled file.
+            processed_videos = await asyncio.gather(
+                *(
+                    asyncio.to_thread(
+                        add_timestamp_overlay_from_file, video_path, max_duration=max_duration
+                    )
+                    for _, video_path in video_data
+                ),
+                return_exceptions=True,
+            )
+            for outcome in processed_videos:
+                if isinstance(outcome, BaseException):
+                    raise outcome
+
+            # Generate output filenames
             # Note: The video is created with .avi extension (XVID codec for OpenCV compatibility)
             # but we'll use .mp4 extension for user convenience (most players handle both)
-            base_name = os.path.splitext(filename)[0]
-            output_filename = f"{base_name}_timestamped.mp4"
+            output_files = []
+            used_names = set()
+            for idx, ((filename, _), processed_video_bytes) in enumerate(
+                zip(video_data, processed_videos)
+            ):
+                logger.info(
+                    f"✅ Timestamp overlay complete for {filename}: "
+                    f"{len(processed_video_bytes) / 1024 / 1024:.2f} MB"
+                )
+                base_name = os.path.splitext(filename)[0]
+                output_filename = f"{base_name}_timestamped.mp4"
+                if output_filename in used_names:
+                    output_filename = f"{base_name}_{idx + 1}_timestamped.mp4"
+                used_names.add(output_filename)
+                output_files.append((output_filename, processed_video_bytes))
+
+            if len(output_files) == 1:
+                output_filename, processed_video_bytes = output_files[0]
+
+                # Return video file as response
+                # Use video/x-msvideo for AVI, but video/mp4 is more widely recognized
+                # The actual file format is AVI (XVID codec) for OpenCV compatibility
+                return Response(
+                    content=processed_video_bytes,
+                    media_type="video/mp4",  # Keep as mp4 for browser compatibility
+                    headers={
+                        "Content-Disposition": f'attachment; filename="{output_filename}"',
+                        "Content-Length": str(len(processed_video_bytes)),
+                    },
+                )
 
-            # Return video file as response
-            # Use video/x-msvideo for AVI, but video/mp4 is more widely recognized
-            # The actual file format is AVI (XVID codec) for OpenCV compatibility
+            # Multiple videos are returned together as one ZIP archive
+            archive_bytes = await asyncio.to_thread(build_zip_archive, output_files)
+            logger.info(
+                f"📦 Packed {len(output_files)} videos into ZIP: "
+                f"{len(archive_bytes) / 1024 / 1024:.2f} MB"
+            )
             return Response(
-                content=processed_video_bytes,
-                media_type="video/mp4",  # Keep as mp4 for browser compatibility
+                content=archive_bytes,
+                media_type="application/zip",
                 headers={
-                    "Content-Disposition": f'attachment; filename="{output_filename}"',
-                    "Content-Length": str(len(processed_video_bytes)),
+                    "Content-Disposition": 'attachment; filename="timestamped_videos.zip"',
+                    "Content-Length": str(len(archive_bytes)),
                 },
             )
 
@@ -572,3 +749,5 @@ async def timestamp_overlay_videos(
     except Exception as e:
         logger.error(f"❌ Unexpected error in timestamp_overlay_videos: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    finally:
+        remove_temp_files(temp_paths)
@@ -1,12 +1,113 @@
-from pydantic import BaseModel, Field, field_validator
+import dataclasses
+import functools
+from collections.abc import Iterator
+from types import MappingProxyType
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator, model_validator
+from pydantic.dataclasses import dataclass
 
 from app.logger import get_logger
 
 logger = get_logger("models")
 
 
+def _alias_map(aliases: dict[str, tuple[str, ...]]) -> MappingProxyType:
+    """Build a read-only lookup from each alias to its canonical value."""
+    return MappingProxyType(
+        {alias: canonical for canonical, names in aliases.items() for alias in names}
+    )
+
+
+def _classify(v: Any, table: MappingProxyType, default: str = "unknown") -> str:
+    """Map a raw value to its canonical label via a lookup table, case- and space-insensitively."""
+    if v is None:
+        return default
+    if not isinstance(v, str):
+        v = str(v)
+    return table.get(v.lower().strip(), default)
+
+
+# Normalization tables for the validators below (one hashed lookup instead of if/elif chains)
+_TEAM_MAP = _alias_map(
+    {
+        "A": ("A", "TEAM A", "TEAMA", "TEAM_A", "TEAM 1", "TEAM1", "1"),
+        "B": ("B", "TEAM B", "TEAMB", "TEAM_B", "TEAM 2", "TEAM2", "2"),
+    }
+)
+_SCAN_QUALITY_MAP = _alias_map(
+    {
+        "good": ("good", "excellent", "high"),
+        "average": ("average", "fair", "medium", "moderate"),
+        "poor": ("poor", "bad", "low"),
+    }
+)
+_LEVEL_MAP = _alias_map(
+    {
+        "high": ("high", "h"),
+        "medium": ("medium", "med", "m", "moderate"),
+        "low": ("low", "l"),
+    }
+)
+_EXECUTION_QUALITY_MAP = _alias_map(
+    {
+        "excellent": ("excellent", "exc", "very good", "perfect"),
+        "good": ("good", "g"),
+        "average": ("average", "avg", "fair", "ok"),
+        "poor": ("poor", "bad", "weak"),
+    }
+)
+_QUALITY_MAP = _alias_map(
+    {
+        "excellent": ("excellent", "exc", "very good"),
+        "good": ("good", "g"),
+        "average": ("average", "avg", "fair"),
+        "poor": ("poor", "bad", "weak"),
+    }
+)
+_DIRECTION_MAP = _alias_map(
+    {
+        "left": ("left", "l"),
+        "right": ("right", "r"),
+        "backward": ("backward", "back", "b"),
+        "forward": ("forward", "front", "f"),
+    }
+)
+# Checked in order when there is no exact match
+_DIRECTION_KEYWORDS = (
+    ("left", "left"),
+    ("right", "right"),
+    ("back", "backward"),
+    ("forward", "forward"),
+    ("front", "forward"),
+)
+# Map common variations to standard event types (also checked in order as substrings)
+_EVENT_MAP = MappingProxyType(
+    {
+        "pass": "pass",
+        "shot": "shot",
+        "dribble": "dribble",
+        "tackle": "tackle",
+        "interception": "interception",
+        "clearance": "clearance",
+        "duel": "duel",
+        "goal": "goal",
+        "set_piece": "set_piece",
+        "set piece": "set_piece",
+        "transition": "transition",
+        "none": "none",
+        "unknown": "unknown",
+        "no event": "none",
+        "no action": "none",
+    }
+)
+
+
 # Comprehensive Pydantic models for structured output validation
-class Player(BaseModel):
+# Per-player/per-frame types are frozen slotted dataclasses: they are created O(frames x players)
+# times per request and never mutated
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Player:
     id: str = Field(description="Player identifier or 'unknown'")
     team: str = Field(description="Team identifier (A, B, or unknown)")
     shirt_number: str | None = Field(
@@ -14,7 +115,8 @@ class Player(BaseModel):
     )
     position: str = Field(description="Player position on field")
     role: str | None = Field(default="unknown", description="Player role/position")
-    coordinates: list[float] = Field(description="Player coordinates [x, y]")
+    # Tuples rather than lists: immutable like the rest of the model and one allocation smaller
+    coordinates: tuple[float, ...] = Field(description="Player coordinates [x, y]")
 
     @field_validator("team", mode="before")
     @classmethod
@@ -27,17 +129,13 @@ class Player(BaseModel):
         if not isinstance(v, str):
             v = str(v)
 
-        v_upper = v.upper().strip()
-
         # Handle various team representations
-        if v_upper in ["A", "TEAM A", "TEAMA", "TEAM_A", "TEAM 1", "TEAM1", "1"]:
-            return "A"
-        elif v_upper in ["B", "TEAM B", "TEAMB", "TEAM_B", "TEAM 2", "TEAM2", "2"]:
-            return "B"
-        else:
+        team = _TEAM_MAP.get(v.upper().strip())
+        if team is None:
             # For any other value, return 'unknown' to avoid validation errors
-            logger.debug(f"Normalizing unknown team value '{v}' to 'unknown'")
+            logger.debug("Normalizing unknown team value '%s' to 'unknown'", v)
             return "unknown"
+        return team
 
     @field_validator("shirt_number", mode="before")
     @classmethod
@@ -51,14 +149,17 @@ class Player(BaseModel):
         return v.strip() if v.strip() else "unknown"
 
 
-class Ball(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Ball:
     visible: bool = Field(description="Whether the ball is visible in the frame")
-    coordinates: list[float] | None = Field(
+    coordinates: tuple[float, ...] | None = Field(
         default=None, description="Ball coordinates [x, y] if visible"
     )
 
 
 class ScanMetrics(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     scan_frequency: str | None = Field(
         default="unknown", description="Head-turns per minute or 'unknown'"
     )
@@ -85,19 +186,7 @@ class ScanMetrics(BaseModel):
     @classmethod
     def normalize_scan_quality(cls, v):
         """Normalize scan quality values."""
-        if v is None:
-            return "unknown"
-        if not isinstance(v, str):
-            v = str(v)
-        v_lower = v.lower().strip()
-        if v_lower in ["good", "excellent", "high"]:
-            return "good"
-        elif v_lower in ["average", "fair", "medium", "moderate"]:
-            return "average"
-        elif v_lower in ["poor", "bad", "low"]:
-            return "poor"
-        else:
-            return "unknown"
+        return _classify(v, _SCAN_QUALITY_MAP)
 
     @field_validator("pre_reception_scans", mode="before")
     @classmethod
@@ -118,19 +207,18 @@ class ScanMetrics(BaseModel):
         if not isinstance(v, str):
             v = str(v)
         v_lower = v.lower().strip()
-        if "left" in v_lower or v_lower == "l":
-            return "left"
-        elif "right" in v_lower or v_lower == "r":
-            return "right"
-        elif "back" in v_lower or v_lower == "b":
-            return "backward"
-        elif "forward" in v_lower or "front" in v_lower or v_lower == "f":
-            return "forward"
-        else:
-            return "unknown"
+        direction = _DIRECTION_MAP.get(v_lower)
+        if direction is not None:
+            return direction
+        for keyword, direction in _DIRECTION_KEYWORDS:
+            if keyword in v_lower:
+                return direction
+        return "unknown"
 
 
 class DecisionIntelligence(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     best_option: str | None = Field(
         default="unknown", description="Optimal choice description or 'unknown'"
     )
@@ -169,22 +257,12 @@ class DecisionIntelligence(BaseModel):
     @classmethod
     def normalize_risk_level(cls, v):
         """Normalize risk level values."""
-        if v is None:
-            return "unknown"
-        if not isinstance(v, str):
-            v = str(v)
-        v_lower = v.lower().strip()
-        if v_lower in ["high", "h"]:
-            return "high"
-        elif v_lower in ["medium", "med", "m", "moderate"]:
-            return "medium"
-        elif v_lower in ["low", "l"]:
-            return "low"
-        else:
-            return "unknown"
+        return _classify(v, _LEVEL_MAP)
 
 
 class TechnicalExecution(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     pass_direction: str | None = Field(
         default="unknown", description="Direction of pass if applicable"
     )
@@ -206,24 +284,12 @@ class TechnicalExecution(BaseModel):
     @classmethod
     def normalize_execution_quality(cls, v):
         """Normalize execution quality values."""
-        if v is None:
-            return "unknown"
-        if not isinstance(v, str):
-            v = str(v)
-        v_lower = v.lower().strip()
-        if v_lower in ["excellent", "exc", "very good", "perfect"]:
-            return "excellent"
-        elif v_lower in ["good", "g"]:
-            return "good"
-        elif v_lower in ["average", "avg", "fair", "ok"]:
-            return "average"
-        elif v_lower in ["poor", "bad", "weak"]:
-            return "poor"
-        else:
-            return "unknown"
+        return _classify(v, _EXECUTION_QUALITY_MAP)
 
 
 class OffBallIntelligence(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     availability_index: str | None = Field(
         default="unknown", description="How playable and accessible the player is"
     )
@@ -241,39 +307,13 @@ class OffBallIntelligence(BaseModel):
     @classmethod
     def normalize_level(cls, v):
         """Normalize level values to high/medium/low/unknown."""
-        if v is None:
-            return "unknown"
-        if not isinstance(v, str):
-            v = str(v)
-        v_lower = v.lower().strip()
-        if v_lower in ["high", "h"]:
-            return "high"
-        elif v_lower in ["medium", "med", "m", "moderate"]:
-            return "medium"
-        elif v_lower in ["low", "l"]:
-            return "low"
-        else:
-            return "unknown"
+        return _classify(v, _LEVEL_MAP)
 
     @field_validator("spatial_awareness", mode="before")
     @classmethod
     def normalize_quality(cls, v):
         """Normalize quality values to excellent/good/average/poor/unknown."""
-        if v is None:
-            return "unknown"
-        if not isinstance(v, str):
-            v = str(v)
-        v_lower = v.lower().strip()
-        if v_lower in ["excellent", "exc", "very good"]:
-            return "excellent"
-        elif v_lower in ["good", "g"]:
-            return "good"
-        elif v_lower in ["average", "avg", "fair"]:
-            return "average"
-        elif v_lower in ["poor", "bad", "weak"]:
-            return "poor"
-        else:
-            return "unknown"
+        return _classify(v, _QUALITY_MAP)
 
     @field_validator("tsx_cognitive_index", mode="before")
     @classmethod
@@ -288,6 +328,8 @@ class OffBallIntelligence(BaseModel):
 
 
 class FormationAnalysis(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     team_a_formation: str | None = Field(default="unknown", description="Team A formation")
     team_b_formation: str | None = Field(default="unknown", description="Team B formation")
     pressing_structure: str | None = Field(
@@ -301,11 +343,22 @@ class FormationAnalysis(BaseModel):
 class GeminiStructuredResponse(BaseModel):
     """Comprehensive structured response model for Gemini analysis with Pydantic validation."""
 
+    # Responses are parsed once and dumped; nothing assigns to them afterwards
+    model_config = ConfigDict(frozen=True)
+
     timestamp: float = Field(description="Frame timestamp in seconds")
     players: list[Player] = Field(default_factory=list, description="List of all visible players")
     ball: Ball = Field(description="Ball visibility and position")
     event: str = Field(description="Current event type")
 
+    @model_validator(mode="before")
+    @classmethod
+    def apply_context_timestamp(cls, data: Any, info: ValidationInfo) -> Any:
+        """Use the timestamp passed in the validation context over whatever the model returned."""
+        if info.context and "timestamp" in info.context and isinstance(data, dict):
+            return {**data, "timestamp": info.context["timestamp"]}
+        return data
+
     @field_validator("event", mode="before")
     @classmethod
     def normalize_event(cls, v):
@@ -319,36 +372,18 @@ class GeminiStructuredResponse(BaseModel):
 
         v_lower = v.lower().strip()
 
-        # Map common variations to standard event types
-        event_mapping = {
-            "pass": "pass",
-            "shot": "shot",
-            "dribble": "dribble",
-            "tackle": "tackle",
-            "interception": "interception",
-            "clearance": "clearance",
-            "duel": "duel",
-            "goal": "goal",
-            "set_piece": "set_piece",
-            "set piece": "set_piece",
-            "transition": "transition",
-            "none": "none",
-            "unknown": "unknown",
-            "no event": "none",
-            "no action": "none",
-        }
-
         # Check exact match first
-        if v_lower in event_mapping:
-            return event_mapping[v_lower]
+        event = _EVENT_MAP.get(v_lower)
+        if event is not None:
+            return event
 
         # Check if it contains any event keyword
-        for key, value in event_mapping.items():
+        for key, value in _EVENT_MAP.items():
             if key in v_lower:
                 return value
 
         # Default to 'unknown' if no match
-        logger.debug(f"Normalizing unknown event value '{v}' to 'unknown'")
+        logger.debug("Normalizing unknown event value '%s' to 'unknown'", v)
         return "unknown"
 
     tactical_context: str | None = Field(default="", description="Tactical context of the frame")
@@ -384,7 +419,10 @@ class GeminiResponse(BaseModel):
     tactical_notes: str
 
 
-class FrameAnalysis(BaseModel):
+# Built only from values derived from already-validated responses, so it is a plain dataclass
+# and construction skips validation (FastAPI and orjson serialize it like the pydantic types)
+@dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
+class FrameAnalysis:
     timestamp: float
     event: str
     ball_position: str  # "x,y" or "Not visible"
@@ -400,7 +438,8 @@ class AnalysisResponse(BaseModel):
     status: str
 
 
-class AnalysisConfig(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class AnalysisConfig:
     frame_interval: float = 1.0  # Extract frame every N seconds
     max_duration: float = 10.0  # Maximum video duration in seconds
     analysis_mode: str = "frame"  # "frame" for Gemini, "multimodal" for OpenRouter
@@ -420,146 +459,153 @@ class AnalysisConfig(BaseModel):
             return "multimodal"
         else:
             # Default to frame-based for unknown values
-            logger.debug(f"Normalizing unknown analysis_mode '{v}' to 'frame'")
+            logger.debug("Normalizing unknown analysis_mode '%s' to 'frame'", v)
             return "frame"
 
 
-def infer_formation(players: list[Player]) -> str:
+# Response values surfaced in tactical notes, in output order, as (section, field, note format).
+# Section fields are skipped when empty or "unknown"; top-level fields (section None) when empty.
+_NOTE_SPECS = (
+    (None, "tactical_notes", "{}"),
+    (None, "tactical_context", "Context: {}"),
+    ("formation_analysis", "pressing_structure", "Pressing: {}"),
+    ("formation_analysis", "build_up_patterns", "Build-up: {}"),
+    ("decision_intelligence", "risk_level", "Risk: {}"),
+    ("decision_intelligence", "decision_time", "Decision time: {}s"),
+    ("decision_intelligence", "reaction_time", "Reaction time: {}s"),
+    ("technical_execution", "execution_quality", "Execution: {}"),
+    ("technical_execution", "pass_success", "Pass: {}"),
+    (None, "performance_insight", "Insight: {}"),
+    ("scan_metrics", "scan_quality", "Scan quality: {}"),
+    ("off_ball_intelligence", "tsx_cognitive_index", "TSX Index: {}"),
+    ("off_ball_intelligence", "spatial_awareness", "Spatial awareness: {}"),
+)
+
+
+def _iter_tactical_notes(data: dict[str, Any]) -> Iterator[str]:
+    """Yield the tactical note for each populated _NOTE_SPECS field of a response dict."""
+    for section, field, note_format in _NOTE_SPECS:
+        if section is None:
+            value = data.get(field)
+            if value:
+                yield note_format.format(value)
+            continue
+        section_data = data.get(section)
+        if section_data:
+            value = section_data.get(field)
+            if value and value != "unknown":
+                yield note_format.format(value)
+
+
+def infer_formation(players: list[dict[str, Any]]) -> str:
     """Infer team formation from player positions."""
     if not players:
         return "Unknown"
 
+    # Formations are stable across consecutive frames, so memoize on the position multiset
+    return _infer_formation_cached(tuple(sorted(p["position"].lower() for p in players)))
+
+
+@functools.lru_cache(maxsize=512)
+def _infer_formation_cached(positions: tuple[str, ...]) -> str:
+    """Infer a formation from a sorted tuple of lowercased player positions."""
     # Simple heuristic: count players in defensive, midfield, attacking zones
     # This is a simplified version - can be enhanced with actual position analysis
-    defensive = sum(1 for p in players if "defensive" in p.position.lower())
-    midfield = sum(1 for p in players if "midfield" in p.position.lower())
-    attacking = sum(1 for p in players if "attacking" in p.position.lower())
+    # Single pass (e.g. "defensive midfield" counts in both)
+    defensive = midfield = attacking = 0
+    for position in positions:
+        if "defensive" in position:
+            defensive += 1
+        if "midfield" in position:
+            midfield += 1
+        if "attacking" in position:
+            attacking += 1
 
     if defensive > 0 and midfield > 0 and attacking > 0:
         return f"{defensive}-{midfield}-{attacking}"
     elif defensive > 0 and midfield > 0:
         return f"{defensive}-{midfield}"
-    elif len(players) >= 3:
-        return f"{len(players)}-player formation"
+    elif len(positions) >= 3:
+        return f"{len(positions)}-player formation"
     else:
         return "Unknown"
 
 
-def transform_gemini_response(gemini_response: GeminiStructuredResponse) -> FrameAnalysis:
-    """Transform validated Gemini structured response to FrameAnalysis model."""
-    timestamp = gemini_response.timestamp
-    logger.debug(f"🔄 Transforming Gemini response for timestamp {timestamp:.2f}s")
+def transform_gemini_response(
+    gemini_response: GeminiStructuredResponse | dict[str, Any],
+) -> FrameAnalysis:
+    """
+    Transform a Gemini structured response to FrameAnalysis model.
 
-    try:
-        # Parse the validated response
-        players_data = gemini_response.players
-        team_a_players = [p for p in players_data if p.team == "A"]
-        team_b_players = [p for p in players_data if p.team == "B"]
-        unknown_team_players = [p for p in players_data if p.team not in ["A", "B"]]
+    Accepts either a validated GeminiStructuredResponse or a dict that has already been
+    validated upstream (its ``model_dump()``, or a default response), so results coming
+    out of the analyzers are not validated a second time.
+    """
+    if isinstance(gemini_response, GeminiStructuredResponse):
+        return _transform_validated(gemini_response)
+    return _transform_dict(gemini_response)
 
-        if unknown_team_players:
-            logger.debug(
-                f"⚠️  Found {len(unknown_team_players)} players with unknown team assignment"
-            )
 
-        logger.debug(
-            f"👥 Players detected: {len(players_data)} total (Team A: {len(team_a_players)}, Team B: {len(team_b_players)})"
-        )
+def transform_gemini_batch(results: list[dict[str, Any]]) -> list[FrameAnalysis]:
+    """
+    Transform a list of already-validated Gemini response dicts to FrameAnalysis models.
+
+    A result that fails to transform becomes a default FrameAnalysis, so one bad entry
+    doesn't abort the batch.
+    """
+    transform = _transform_dict
+    return [transform(result) for result in results]
+
+
+def _transform_validated(gemini_response: GeminiStructuredResponse) -> FrameAnalysis:
+    """Transform a validated GeminiStructuredResponse model to FrameAnalysis."""
+    return _transform_dict(gemini_response.model_dump())
+
+
+def _transform_dict(data: dict[str, Any]) -> FrameAnalysis:
+    """Transform an already-validated Gemini response dict to FrameAnalysis."""
+    # A non-dict result fails inside the try below and gets the default analysis
+    timestamp = data.get("timestamp", 0.0) if isinstance(data, dict) else 0.0
+
+    try:
+        # Default responses only carry the core fields, so optional sections may be absent
+        players_data = data["players"]
+        team_a_players = []
+        team_b_players = []
+        unknown_team_count = 0
+        for p in players_data:
+            team = p.get("team")
+            if team == "A":
+                team_a_players.append(p)
+            elif team == "B":
+                team_b_players.append(p)
+            else:
+                unknown_team_count += 1
 
         # Get formations from formation_analysis or infer
-        formation_analysis = gemini_response.formation_analysis
+        formation_analysis = data.get("formation_analysis")
         team_a_shape = (
-            formation_analysis.team_a_formation
-            if formation_analysis and formation_analysis.team_a_formation != "unknown"
+            formation_analysis["team_a_formation"]
+            if formation_analysis and formation_analysis["team_a_formation"] != "unknown"
             else infer_formation(team_a_players)
         )
         team_b_shape = (
-            formation_analysis.team_b_formation
-            if formation_analysis and formation_analysis.team_b_formation != "unknown"
+            formation_analysis["team_b_formation"]
+            if formation_analysis and formation_analysis["team_b_formation"] != "unknown"
             else infer_formation(team_b_players)
         )
 
-        logger.debug(f"📐 Formations: Team A: {team_a_shape}, Team B: {team_b_shape}")
-
         # Handle ball position
-        ball = gemini_response.ball
+        ball = data["ball"]
         ball_pos = "Not visible"
-        if ball.visible and ball.coordinates:
-            coords = ball.coordinates
+        if ball["visible"] and ball.get("coordinates"):
+            coords = ball["coordinates"]
             ball_pos = f"{coords[0]}, {coords[1]}"
-            logger.debug(f"⚽ Ball visible at: {ball_pos}")
-        else:
-            logger.debug("⚽ Ball not visible")
 
-        event = gemini_response.event
-        logger.debug(f"🎯 Event detected: {event}")
+        event = data["event"]
 
         # Build comprehensive tactical notes from all available data
-        tactical_notes_parts = []
-
-        # Base tactical notes
-        if gemini_response.tactical_notes:
-            tactical_notes_parts.append(gemini_response.tactical_notes)
-
-        # Tactical context
-        if gemini_response.tactical_context:
-            tactical_notes_parts.append(f"Context: {gemini_response.tactical_context}")
-
-        # Formation analysis
-        if formation_analysis:
-            if (
-                formation_analysis.pressing_structure
-                and formation_analysis.pressing_structure != "unknown"
-            ):
-                tactical_notes_parts.append(f"Pressing: {formation_analysis.pressing_structure}")
-            if (
-                formation_analysis.build_up_patterns
-                and formation_analysis.build_up_patterns != "unknown"
-            ):
-                tactical_notes_parts.append(f"Build-up: {formation_analysis.build_up_patterns}")
-
-        # Decision intelligence
-        decision_intel = gemini_response.decision_intelligence
-        if decision_intel:
-            if decision_intel.risk_level and decision_intel.risk_level != "unknown":
-                tactical_notes_parts.append(f"Risk: {decision_intel.risk_level}")
-            if decision_intel.decision_time and decision_intel.decision_time != "unknown":
-                tactical_notes_parts.append(f"Decision time: {decision_intel.decision_time}s")
-            if decision_intel.reaction_time and decision_intel.reaction_time != "unknown":
-                tactical_notes_parts.append(f"Reaction time: {decision_intel.reaction_time}s")
-
-        # Technical execution
-        tech_exec = gemini_response.technical_execution
-        if tech_exec:
-            if tech_exec.execution_quality and tech_exec.execution_quality != "unknown":
-                tactical_notes_parts.append(f"Execution: {tech_exec.execution_quality}")
-            if tech_exec.pass_success and tech_exec.pass_success != "unknown":
-                tactical_notes_parts.append(f"Pass: {tech_exec.pass_success}")
-
-        # Performance insight
-        if gemini_response.performance_insight:
-            tactical_notes_parts.append(f"Insight: {gemini_response.performance_insight}")
-
-        # Scan metrics
-        scan_metrics = gemini_response.scan_metrics
-        if scan_metrics:
-            if scan_metrics.scan_quality and scan_metrics.scan_quality != "unknown":
-                tactical_notes_parts.append(f"Scan quality: {scan_metrics.scan_quality}")
-
-        # Off-ball intelligence
-        off_ball = gemini_response.off_ball_intelligence
-        if off_ball:
-            if off_ball.tsx_cognitive_index and off_ball.tsx_cognitive_index != "unknown":
-                tactical_notes_parts.append(f"TSX Index: {off_ball.tsx_cognitive_index}")
-            if off_ball.spatial_awareness and off_ball.spatial_awareness != "unknown":
-                tactical_notes_parts.append(f"Spatial awareness: {off_ball.spatial_awareness}")
-
-        # Combine all notes
-        tactical_notes = (
-            " | ".join(tactical_notes_parts)
-            if tactical_notes_parts
-            else "No tactical notes available"
-        )
+        tactical_notes = " | ".join(_iter_tactical_notes(data)) or "No tactical notes available"
 
         result = FrameAnalysis(
             timestamp=timestamp,
@@ -571,7 +617,20 @@ def transform_gemini_response(gemini_response: GeminiStructuredResponse) -> Fram
             tactical_notes=tactical_notes,
         )
 
-        logger.debug(f"✅ Successfully transformed response for timestamp {timestamp:.2f}s")
+        # One summary line per frame; arguments are only formatted when DEBUG is enabled
+        logger.debug(
+            "✅ Transformed response for timestamp %.2fs | Players: %d (A: %d, B: %d, unknown: %d)"
+            " | Formations: %s / %s | Ball: %s | Event: %s",
+            timestamp,
+            len(players_data),
+            len(team_a_players),
+            len(team_b_players),
+            unknown_team_count,
+            team_a_shape,
+            team_b_shape,
+            ball_pos,
+            event,
+        )
         return result
     except Exception as e:
         logger.error(
@@ -4,12 +4,16 @@ OpenRouter multimodal video analyzer.
 
 import asyncio
 import base64
+import hashlib
 import json
+import logging
 import os
-import time
+from collections import OrderedDict
 from typing import Any
 
 import httpx
+import orjson
+from aiolimiter import AsyncLimiter
 
 from app.logger import get_logger
 from app.models import GeminiStructuredResponse
@@ -23,9 +27,17 @@ OPENROUTER_MODEL = os.getenv("OPENROUTER_MODEL", "google/gemini-3-pro-preview")
 OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
 
 # Rate limiting (more conservative than Gemini due to unknown limits)
-semaphore = asyncio.Semaphore(3)  # Max 3 concurrent requests
-rate_limit_delay = 2.0  # 2 seconds between requests
-last_request_time = 0.0
+limiter = AsyncLimiter(max_rate=1, time_period=2.0)  # 1 request every 2 seconds
+
+# One client for the whole process so connections are reused across requests
+_http_client: httpx.AsyncClient | None = None
+
+# LRU cache of validated analyses keyed by video content hash (re-uploads skip the API)
+video_cache_size = 32
+_video_cache: OrderedDict[bytes, list[dict[str, Any]]] = OrderedDict()
+
+# Stands in for the video data URL in the payload until the base64 bytes are spliced in
+_VIDEO_URL_PLACEHOLDER = "__VIDEO_DATA_URL__"
 
 
 class QuotaExhaustedError(Exception):
@@ -46,6 +58,37 @@ class OpenRouterError(Exception):
     pass
 
 
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(timeout=300.0)  # 5-minute timeout for videos
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared HTTP client and its pooled connections."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def get_video_key(video_bytes: bytes) -> bytes:
+    """Hash video content (and the model it is analyzed with) for the analysis cache."""
+    video_hash = hashlib.blake2b(OPENROUTER_MODEL.encode(), digest_size=16)
+    video_hash.update(video_bytes)
+    return video_hash.digest()
+
+
+def remember_analyses(video_key: bytes, analyses: list[dict[str, Any]]):
+    """Add a video's analyses to the LRU, evicting the least recently used entry when full."""
+    _video_cache[video_key] = analyses
+    _video_cache.move_to_end(video_key)
+    if len(_video_cache) > video_cache_size:
+        _video_cache.popitem(last=False)
+
+
 def get_structured_output_schema() -> dict:
     """
     Get JSON Schema for structured output enforcement.
@@ -236,6 +279,14 @@ def get_structured_output_schema() -> dict:
     }
 
 
+def extract_json_text(content: str) -> str:
+    """Return the JSON payload of a model reply, without surrounding markdown code fences."""
+    content = content.strip()
+    if not content.startswith("```"):
+        return content
+    return content.removeprefix("```json").removeprefix("```").removesuffix("```").strip()
+
+
 def get_default_response(timestamp: float, error_message: str = "") -> dict[str, Any]:
     """Return a default response structure when analysis fails."""
     return {
@@ -265,8 +316,6 @@ async def analyze_video_multimodal(video_bytes: bytes, retries: int = 3) -> list
         ServiceUnavailableError: If service is unavailable
         OpenRouterError: For other API errors
     """
-    global last_request_time
-
     logger.info("🎬 Starting multimodal video analysis with OpenRouter")
 
     # Validate API key
@@ -274,21 +323,19 @@ async def analyze_video_multimodal(video_bytes: bytes, retries: int = 3) -> list
         logger.error("❌ OPENROUTER_API_KEY not found in environment variables")
         raise ValueError("OPENROUTER_API_KEY is required for multimodal analysis")
 
+    # hashlib releases the GIL on large buffers, so hash off the event loop
+    video_key = await asyncio.to_thread(get_video_key, video_bytes)
+    cached = _video_cache.get(video_key)
+    if cached is not None:
+        _video_cache.move_to_end(video_key)
+        logger.info(f"♻️  Reusing cached analysis for identical video ({len(cached)} analyses)")
+        return list(cached)
+
     logger.info(f"🤖 Using model: {OPENROUTER_MODEL}")
 
-    # Rate limiting
-    async with semaphore:
-        current_time = time.time()
-        time_since_last = current_time - last_request_time
-        if time_since_last < rate_limit_delay:
-            wait_time = rate_limit_delay - time_since_last
-            logger.debug(f"⏳ Rate limiting: waiting {wait_time:.2f}s")
-            await asyncio.sleep(wait_time)
-        last_request_time = time.time()
-
-    # Encode video to base64
+    # Encode video to base64 (kept as bytes; it is spliced into the request body as-is)
     try:
-        video_base64 = base64.b64encode(video_bytes).decode("utf-8")
+        video_base64 = base64.b64encode(video_bytes)
         video_size_mb = len(video_bytes) / 1024 / 1024
         base64_size_mb = len(video_base64) / 1024 / 1024
         logger.info(f"📦 Video encoded: {video_size_mb:.2f} MB → {base64_size_mb:.2f} MB base64")
@@ -308,7 +355,7 @@ async def analyze_video_multimodal(video_bytes: bytes, retries: int = 3) -> list
                     {"type": "text", "text": prompt},
                     {
                         "type": "video_url",
-                        "video_url": {"url": f"data:video/mp4;base64,{video_base64}"},
+                        "video_url": {"url": _VIDEO_URL_PLACEHOLDER},
                     },
                 ],
             }
@@ -328,6 +375,12 @@ async def analyze_video_multimodal(video_bytes: bytes, retries: int = 3) -> list
             "📋 Structured outputs not supported by this model, using prompt-based JSON enforcement"
         )
 
+    # Serialize once rather than on every retry. Base64 needs no JSON escaping, so splice the
+    # bytes in directly instead of decoding them to str and re-encoding the whole payload
+    head, tail = orjson.dumps(payload).split(_VIDEO_URL_PLACEHOLDER.encode(), 1)
+    body = b"".join((head, b"data:video/mp4;base64,", video_base64, tail))
+    del video_base64, head, tail
+
     headers = {
         "Authorization": f"Bearer {OPENROUTER_API_KEY}",
         "Content-Type": "application/json",
@@ -338,141 +391,133 @@ async def analyze_video_multimodal(video_bytes: bytes, retries: int = 3) -> list
     # Send request with retries
     for attempt in range(retries):
         try:
+            # Rate limiting: every attempt, retries included, waits for its own token instead
+            # of racing other callers on a shared timestamp
+            await limiter.acquire()
             logger.info(f"🔄 Sending request to OpenRouter (attempt {attempt + 1}/{retries})")
 
-            async with httpx.AsyncClient(timeout=300.0) as client:  # 5-minute timeout for videos
-                response = await client.post(OPENROUTER_API_URL, json=payload, headers=headers)
+            client = get_http_client()
+            response = await client.post(OPENROUTER_API_URL, content=body, headers=headers)
 
-                # Handle errors
-                if response.status_code == 429:
-                    error_text = response.text
-                    error_detail = (
-                        response.json().get("error", {}).get("message", error_text)
-                        if response.headers.get("content-type", "").startswith("application/json")
-                        else error_text
-                    )
+            # Handle errors
+            if response.status_code == 429:
+                error_text = response.text
+                error_detail = (
+                    response.json().get("error", {}).get("message", error_text)
+                    if response.headers.get("content-type", "").startswith("application/json")
+                    else error_text
+                )
 
-                    if "quota" in error_detail.lower() or "limit" in error_detail.lower():
-                        logger.error("❌ OpenRouter quota exceeded")
-                        raise QuotaExhaustedError("OpenRouter quota exceeded")
-                    else:
-                        # Rate limit - retry after delay
-                        retry_delay = 60
-                        logger.warning(f"🚫 Rate limit hit, waiting {retry_delay}s")
-                        await asyncio.sleep(retry_delay)
-                        continue
-
-                elif response.status_code == 503:
-                    logger.warning("⚠️ OpenRouter service unavailable (503)")
-                    raise ServiceUnavailableError("OpenRouter service unavailable")
-
-                elif response.status_code >= 500:
-                    error_msg = response.text
-                    logger.error(
-                        f"❌ OpenRouter server error: {response.status_code} - {error_msg}"
-                    )
-                    raise OpenRouterError(f"OpenRouter server error: {response.status_code}")
-
-                elif response.status_code >= 400:
-                    try:
-                        error_data = response.json()
-                        error_detail = error_data.get("error", {}).get("message", "Unknown error")
-                    except Exception:
-                        error_detail = response.text
+                if "quota" in error_detail.lower() or "limit" in error_detail.lower():
+                    logger.error("❌ OpenRouter quota exceeded")
+                    raise QuotaExhaustedError("OpenRouter quota exceeded")
+                else:
+                    # Rate limit - retry after delay
+                    retry_delay = 60
+                    logger.warning(f"🚫 Rate limit hit, waiting {retry_delay}s")
+                    await asyncio.sleep(retry_delay)
+                    continue
+
+            elif response.status_code == 503:
+                logger.warning("⚠️ OpenRouter service unavailable (503)")
+                raise ServiceUnavailableError("OpenRouter service unavailable")
+
+            elif response.status_code >= 500:
+                error_msg = response.text
+                logger.error(f"❌ OpenRouter server error: {response.status_code} - {error_msg}")
+                raise OpenRouterError(f"OpenRouter server error: {response.status_code}")
+
+            elif response.status_code >= 400:
+                try:
+                    error_data = response.json()
+                    error_detail = error_data.get("error", {}).get("message", "Unknown error")
+                except Exception:
+                    error_detail = response.text
+                logger.error(f"❌ OpenRouter client error: {response.status_code} - {error_detail}")
+                raise OpenRouterError(f"OpenRouter client error: {error_detail}")
+
+            # Parse response
+            try:
+                response_text = response.text
+                logger.debug(
+                    "📥 Raw response (first 1000 chars): %.1000s", response_text or "(empty)"
+                )
+
+                if not response_text or not response_text.strip():
                     logger.error(
-                        f"❌ OpenRouter client error: {response.status_code} - {error_detail}"
+                        f"❌ Empty response from OpenRouter (status {response.status_code})"
                     )
-                    raise OpenRouterError(f"OpenRouter client error: {error_detail}")
+                    logger.error(f"Response headers: {dict(response.headers)}")
+                    raise OpenRouterError("Empty response from OpenRouter API")
+
+                response_data = orjson.loads(response.content)
+            except Exception as e:
+                logger.error(f"❌ Failed to parse JSON response: {str(e)}")
+                logger.debug("Response text: %.500s", response.text or "(empty)")
+                raise OpenRouterError(f"Invalid JSON response: {str(e)}")
+
+            # Log full response structure for debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📋 Response structure keys: %s", list(response_data))
+                logger.debug(f"📋 Full response data: {json.dumps(response_data, indent=2)[:1000]}")
 
-                # Parse response
+            # Extract content
+            try:
+                content = response_data["choices"][0]["message"]["content"]
+            except (KeyError, IndexError) as e:
+                logger.error(f"❌ Unexpected response structure: {str(e)}")
+                logger.error(f"📋 Response data: {json.dumps(response_data, indent=2)}")
+                raise OpenRouterError(f"Invalid response format: {str(e)}")
+
+            # Parse JSON from content
+            try:
+                content = extract_json_text(content)
+                json_data = orjson.loads(content)
+            except orjson.JSONDecodeError as e:
+                logger.error(f"❌ Failed to parse JSON from content: {str(e)}")
+                logger.debug("Response content: %.500s...", content)
+                raise OpenRouterError(f"Invalid JSON in response: {str(e)}")
+
+            # Check if response is an array or single object
+            if isinstance(json_data, list):
+                logger.info(f"📊 Received JSON array with {len(json_data)} analyses")
+                json_responses = json_data
+            elif isinstance(json_data, dict):
+                logger.info("📊 Received single JSON object, wrapping in array")
+                json_responses = [json_data]
+            else:
+                logger.error(f"❌ Unexpected JSON type: {type(json_data)}")
+                raise OpenRouterError(f"Expected JSON array or object, got {type(json_data)}")
+
+            # Validate and normalize each response
+            validated_responses = []
+            for idx, json_response in enumerate(json_responses):
+                # Normalize to GeminiStructuredResponse format
+                normalized_response = normalize_openrouter_response(json_response)
+
+                # Validate with Pydantic
                 try:
-                    response_text = response.text
+                    validated = GeminiStructuredResponse.model_validate(normalized_response)
+                    validated_responses.append(validated.model_dump())
                     logger.debug(
-                        f"📥 Raw response (first 1000 chars): {response_text[:1000] if response_text else '(empty)'}"
+                        "✅ Validated analysis %d/%d at timestamp %s",
+                        idx + 1,
+                        len(json_responses),
+                        validated.timestamp,
                     )
-
-                    if not response_text or not response_text.strip():
-                        logger.error(
-                            f"❌ Empty response from OpenRouter (status {response.status_code})"
-                        )
-                        logger.error(f"Response headers: {dict(response.headers)}")
-                        raise OpenRouterError("Empty response from OpenRouter API")
-
-                    response_data = response.json()
                 except Exception as e:
-                    logger.error(f"❌ Failed to parse JSON response: {str(e)}")
-                    logger.debug(
-                        f"Response text: {response.text[:500] if response.text else '(empty)'}"
-                    )
-                    raise OpenRouterError(f"Invalid JSON response: {str(e)}")
-
-                # Log full response structure for debugging
-                logger.debug(f"📋 Response structure keys: {list(response_data.keys())}")
-                logger.debug(f"📋 Full response data: {json.dumps(response_data, indent=2)[:1000]}")
-
-                # Extract content
-                try:
-                    content = response_data["choices"][0]["message"]["content"]
-                except (KeyError, IndexError) as e:
-                    logger.error(f"❌ Unexpected response structure: {str(e)}")
-                    logger.error(f"📋 Response data: {json.dumps(response_data, indent=2)}")
-                    raise OpenRouterError(f"Invalid response format: {str(e)}")
-
-                # Parse JSON from content
-                try:
-                    # Remove markdown code blocks if present
-                    if content.startswith("```json"):
-                        content = content.removeprefix("```json").strip()
-                    if content.startswith("```"):
-                        content = content.removeprefix("```").strip()
-                    if content.endswith("```"):
-                        content = content.removesuffix("```").strip()
-
-                    json_data = json.loads(content)
-                except json.JSONDecodeError as e:
-                    logger.error(f"❌ Failed to parse JSON from content: {str(e)}")
-                    logger.debug(f"Response content: {content[:500]}...")
-                    raise OpenRouterError(f"Invalid JSON in response: {str(e)}")
-
-                # Check if response is an array or single object
-                if isinstance(json_data, list):
-                    logger.info(f"📊 Received JSON array with {len(json_data)} analyses")
-                    json_responses = json_data
-                elif isinstance(json_data, dict):
-                    logger.info("📊 Received single JSON object, wrapping in array")
-                    json_responses = [json_data]
-                else:
-                    logger.error(f"❌ Unexpected JSON type: {type(json_data)}")
-                    raise OpenRouterError(f"Expected JSON array or object, got {type(json_data)}")
-
-                # Validate and normalize each response
-                validated_responses = []
-                for idx, json_response in enumerate(json_responses):
-                    # Normalize to GeminiStructuredResponse format
-                    normalized_response = normalize_openrouter_response(json_response)
-
-                    # Validate with Pydantic
-                    try:
-                        validated = GeminiStructuredResponse.model_validate(normalized_response)
-                        validated_responses.append(validated.model_dump())
-                        logger.debug(
-                            f"✅ Validated analysis {idx + 1}/{len(json_responses)} at timestamp {validated.timestamp}"
-                        )
-                    except Exception as e:
-                        logger.error(
-                            f"❌ Pydantic validation error for analysis {idx + 1}: {str(e)}"
-                        )
+                    logger.error(f"❌ Pydantic validation error for analysis {idx + 1}: {str(e)}")
+                    if logger.isEnabledFor(logging.DEBUG):
                         logger.debug(
                             f"Normalized data: {json.dumps(normalized_response, indent=2)[:500]}"
                         )
-                        raise OpenRouterError(
-                            f"Response validation failed for analysis {idx + 1}: {str(e)}"
-                        )
+                    raise OpenRouterError(
+                        f"Response validation failed for analysis {idx + 1}: {str(e)}"
+                    )
 
-                logger.info(
-                    f"✅ Multimodal analysis successful: {len(validated_responses)} analyses"
-                )
-                return validated_responses
+            logger.info(f"✅ Multimodal analysis successful: {len(validated_responses)} analyses")
+            remember_analyses(video_key, validated_responses)
+            return list(validated_responses)
 
         except QuotaExhaustedError:
             logger.error("❌ Quota exhausted")
@@ -488,7 +533,7 @@ async def analyze_video_multimodal(video_bytes: bytes, retries: int = 3) -> list
         except OpenRouterError:
             if attempt < retries - 1:
                 backoff = 2**attempt  # Exponential backoff: 1s, 2s, 4s
-                logger.debug(f"⏳ Retrying in {backoff}s")
+                logger.debug("⏳ Retrying in %ss", backoff)
                 await asyncio.sleep(backoff)
                 continue
             raise
@@ -2,18 +2,8 @@
 Analysis prompts for Gemini AI video analysis.
 """
 
-
-def get_analysis_prompt(timestamp: float) -> str:
-    """
-    Generate the comprehensive football analysis prompt for Gemini.
-
-    Args:
-        timestamp: Current frame timestamp in seconds
-
-    Returns:
-        Formatted prompt string
-    """
-    return f"""Analyze the provided football match video in **complete tactical, technical, and cognitive detail**.
+# Frame analysis prompt template. Only the timestamp placeholders vary per frame.
+ANALYSIS_PROMPT_TEMPLATE = """Analyze the provided football match video in **complete tactical, technical, and cognitive detail**.
 
 ### **Player & Team Identification**
 
@@ -35,7 +25,7 @@ For **each timestamp**, identify and describe:
 * Transitions (attack ↔ defense)
 * Defensive shape changes and pressing triggers
 
-**Current Frame Timestamp: {timestamp:.2f} seconds**
+**Current Frame Timestamp: {timestamp_label}**
 
 ---
 
@@ -180,7 +170,7 @@ Provide **all outputs strictly in JSON format** with the following structure:
 
 ```json
 {{
-  "timestamp": {timestamp},
+  "timestamp": {timestamp_value},
   "players": [
     {{
       "id": "string_or_unknown",
@@ -243,6 +233,82 @@ Provide **all outputs strictly in JSON format** with the following structure:
 - Be as detailed as possible while maintaining JSON validity
 - Focus on observable actions and behaviors in the current frame"""
 
+# Timestamp-independent variant used as a cached system instruction
+ANALYSIS_SYSTEM_PROMPT = ANALYSIS_PROMPT_TEMPLATE.format(
+    timestamp_label="provided in the message sent with each frame",
+    timestamp_value="number",
+)
+
+# Template rendered once and split around its two timestamp slots, so building a
+# per-frame prompt is a plain concatenation
+_PROMPT_HEAD, _PROMPT_MIDDLE, _PROMPT_TAIL = ANALYSIS_PROMPT_TEMPLATE.format(
+    timestamp_label="\0", timestamp_value="\0"
+).split("\0")
+
+
+def get_analysis_prompt(timestamp: float) -> str:
+    """
+    Generate the comprehensive football analysis prompt for Gemini.
+
+    Args:
+        timestamp: Current frame timestamp in seconds
+
+    Returns:
+        Formatted prompt string
+    """
+    return f"{_PROMPT_HEAD}{timestamp:.2f} seconds{_PROMPT_MIDDLE}{timestamp}{_PROMPT_TAIL}"
+
+
+def get_frame_message(timestamp: float) -> str:
+    """
+    Generate the per-frame user message that accompanies ANALYSIS_SYSTEM_PROMPT.
+
+    Args:
+        timestamp: Current frame timestamp in seconds
+
+    Returns:
+        Short message carrying only the frame timestamp
+    """
+    return (
+        f"Current Frame Timestamp: {timestamp:.2f} seconds. "
+        f'Use {timestamp} as the "timestamp" value.'
+    )
+
+
+def get_batch_frame_message(timestamps: list[float]) -> str:
+    """
+    Generate the user message for a multi-frame request.
+
+    Args:
+        timestamps: Timestamps in seconds of the attached frames, in attachment order
+
+    Returns:
+        Message mapping each attached image to its timestamp and requesting a JSON array
+    """
+    frame_lines = "\n".join(
+        f"- Image {index}: timestamp {timestamp}"
+        for index, timestamp in enumerate(timestamps, start=1)
+    )
+    return f"""{len(timestamps)} frames are attached, in chronological order:
+{frame_lines}
+
+Analyze each frame independently and return a JSON ARRAY with exactly {len(timestamps)} objects,
+one per image in the same order. Each object must follow the output structure above and use
+that image's timestamp as its "timestamp" value."""
+
+
+def get_batch_analysis_prompt(timestamps: list[float]) -> str:
+    """
+    Generate the full prompt for a multi-frame request.
+
+    Args:
+        timestamps: Timestamps in seconds of the attached frames, in attachment order
+
+    Returns:
+        Static analysis instructions followed by the per-request frame message
+    """
+    return f"{ANALYSIS_SYSTEM_PROMPT}\n\n---\n\n{get_batch_frame_message(timestamps)}"
+
 
 def get_multimodal_analysis_prompt() -> str:
     """
@@ -13,7 +13,7 @@ analysis_store: dict[str, dict[str, Any]] = {}
 def generate_session_id() -> str:
     """Generate a unique session ID."""
     session_id = f"session_{uuid.uuid4().hex[:12]}"
-    logger.debug(f"🆔 Generated session ID: {session_id}")
+    logger.debug("🆔 Generated session ID: %s", session_id)
     return session_id
 
 
@@ -32,7 +32,7 @@ def cleanup_old_sessions():
         logger.info(f"🧹 Cleaning up {len(sessions_to_remove)} old session(s)")
         for session_id in sessions_to_remove:
             del analysis_store[session_id]
-            logger.debug(f"🗑️  Removed old session: {session_id}")
+            logger.debug("🗑️  Removed old session: %s", session_id)
 
 
 def get_session(session_id: str) -> dict[str, Any] | None:
@@ -40,9 +40,9 @@ def get_session(session_id: str) -> dict[str, Any] | None:
     cleanup_old_sessions()
     session = analysis_store.get(session_id)
     if session:
-        logger.debug(f"📥 Retrieved session: {session_id} (status: {session.get('status')})")
+        logger.debug("📥 Retrieved session: %s (status: %s)", session_id, session.get("status"))
     else:
-        logger.debug(f"❌ Session not found: {session_id}")
+        logger.debug("❌ Session not found: %s", session_id)
     return session
 
 
@@ -57,7 +57,7 @@ def create_session() -> str:
         "processed_frames": 0,
     }
     logger.info(f"✨ Created new session: {session_id}")
-    logger.debug(f"📊 Active sessions: {len(analysis_store)}")
+    logger.debug("📊 Active sessions: %d", len(analysis_store))
     return session_id
 
 
@@ -74,6 +74,6 @@ def update_session(session_id: str, **kwargs):
         if "processed_frames" in kwargs or "total_frames" in kwargs:
             processed = analysis_store[session_id].get("processed_frames", 0)
             total = analysis_store[session_id].get("total_frames", 0)
-            logger.debug(f"📈 Session {session_id} progress: {processed}/{total}")
+            logger.debug("📈 Session %s progress: %d/%d", session_id, processed, total)
     else:
         logger.warning(f"⚠️  Attempted to update non-existent session: {session_id}")
@@ -1,30 +1,36 @@
-import base64
 import os
 import tempfile
 from io import BytesIO
 
 import cv2
 import numpy as np
-from PIL import Image
+from PIL import Image, ImageStat
 
 from app.logger import get_logger
 
 logger = get_logger("video_processor")
 
+# Frames above these limits are downscaled before upload; larger images only add image tokens
+MAX_FRAME_BYTES = 512 * 1024
+MAX_FRAME_DIMENSION = 1024
+
 
 def extract_frames(
     video_bytes: bytes, fps_interval: float = 1.0, max_duration: float = 10.0
-) -> list[tuple[float, str]]:
+) -> list[tuple[float, bytes]]:
     """
     Extract frames from video at specified intervals.
 
+    Writes the video to a temporary file and extracts from it; callers that already have
+    the video on disk should use extract_frames_from_file.
+
     Args:
         video_bytes: Video file as bytes
         fps_interval: Extract one frame every N seconds (default: 2.0)
         max_duration: Maximum video duration in seconds (default: 15.0)
 
     Returns:
-        List of tuples: (timestamp, base64_encoded_frame)
+        List of tuples: (timestamp, jpeg_bytes)
 
     Raises:
         ValueError: If input validation fails
@@ -35,32 +41,19 @@ def extract_frames(
         logger.error("❌ Empty video bytes provided")
         raise ValueError("Video bytes cannot be empty")
 
-    if fps_interval <= 0:
-        logger.error(f"❌ Invalid fps_interval: {fps_interval}")
-        raise ValueError(f"fps_interval must be greater than 0, got {fps_interval}")
-
-    if max_duration <= 0:
-        logger.error(f"❌ Invalid max_duration: {max_duration}")
-        raise ValueError(f"max_duration must be greater than 0, got {max_duration}")
-
     if len(video_bytes) > 100 * 1024 * 1024:  # 100MB
         logger.error(f"❌ Video too large: {len(video_bytes) / 1024 / 1024:.2f} MB")
         raise ValueError(
             f"Video file too large: {len(video_bytes) / 1024 / 1024:.2f} MB (max 100MB)"
         )
 
-    logger.info(
-        f"🎬 Starting frame extraction | Interval: {fps_interval}s | Max duration: {max_duration}s"
-    )
-    logger.debug(f"Video size: {len(video_bytes) / 1024 / 1024:.2f} MB")
-
     tmp_path = None
     try:
         with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as tmp_file:
             tmp_file.write(video_bytes)
             tmp_path = tmp_file.name
 
-        logger.debug(f"📁 Created temporary video file: {tmp_path}")
+        logger.debug("📁 Created temporary video file: %s", tmp_path)
 
         if not os.path.exists(tmp_path):
             raise RuntimeError("Failed to create temporary video file")
@@ -69,9 +62,53 @@ def extract_frames(
         logger.error(f"❌ Failed to create temporary file: {str(e)}", exc_info=True)
         raise RuntimeError(f"Failed to create temporary video file: {str(e)}")
 
+    try:
+        return extract_frames_from_file(tmp_path, fps_interval, max_duration)
+
+    finally:
+        # Clean up temporary file
+        if tmp_path and os.path.exists(tmp_path):
+            try:
+                os.unlink(tmp_path)
+                logger.debug("🧹 Cleaned up temporary file: %s", tmp_path)
+            except Exception as e:
+                logger.warning(f"⚠️  Failed to delete temporary file {tmp_path}: {str(e)}")
+
+
+def extract_frames_from_file(
+    video_path: str, fps_interval: float = 1.0, max_duration: float = 10.0
+) -> list[tuple[float, bytes]]:
+    """
+    Extract frames at specified intervals from a video file on disk.
+
+    Args:
+        video_path: Path to the video file
+        fps_interval: Extract one frame every N seconds (default: 1.0)
+        max_duration: Maximum video duration in seconds (default: 10.0)
+
+    Returns:
+        List of tuples: (timestamp, jpeg_bytes)
+
+    Raises:
+        ValueError: If input validation fails
+        RuntimeError: If video processing fails
+    """
+    if fps_interval <= 0:
+        logger.error(f"❌ Invalid fps_interval: {fps_interval}")
+        raise ValueError(f"fps_interval must be greater than 0, got {fps_interval}")
+
+    if max_duration <= 0:
+        logger.error(f"❌ Invalid max_duration: {max_duration}")
+        raise ValueError(f"max_duration must be greater than 0, got {max_duration}")
+
+    logger.info(
+        f"🎬 Starting frame extraction | Interval: {fps_interval}s | Max duration: {max_duration}s"
+    )
+    logger.debug("Video size: %.2f MB", os.path.getsize(video_path) / 1024 / 1024)
+
     video = None
     try:
-        video = cv2.VideoCapture(tmp_path)
+        video = cv2.VideoCapture(video_path)
 
         if not video.isOpened():
             logger.error("❌ Failed to open video file")
@@ -127,11 +164,24 @@ def extract_frames(
             int(actual_duration / fps_interval) + 1
         )  # Safety limit based on actual duration
 
+        # Decode and resize into the same arrays every frame; only the JPEG bytes are kept
+        decoded = None
+        resized = None
+
         try:
             while current_frame < max_frame_number and extracted_count < max_frames:
-                ret, frame = video.read()
+                if current_frame % frame_interval:
+                    # Frames between samples are only grabbed; retrieve() would convert them to BGR
+                    if not video.grab():
+                        logger.debug("📹 Reached end of video at frame %d", current_frame)
+                        break
+                    current_frame += 1
+                    continue
+
+                ret, decoded = video.read(decoded)
+                frame = decoded
                 if not ret:
-                    logger.debug(f"📹 Reached end of video at frame {current_frame}")
+                    logger.debug("📹 Reached end of video at frame %d", current_frame)
                     break
 
                 # Validate frame
@@ -146,37 +196,41 @@ def extract_frames(
                 # Stop if we've exceeded max_duration
                 if timestamp >= max_duration:
                     logger.debug(
-                        f"⏹️  Reached max_duration ({max_duration}s) at frame {current_frame}"
+                        "⏹️  Reached max_duration (%ss) at frame %d", max_duration, current_frame
                     )
                     break
 
-                # Extract frame at specified intervals
-                if current_frame % frame_interval == 0:
-                    try:
-                        # Resize frame to max 720p for faster processing
-                        original_height, original_width = frame.shape[:2]
-                        if original_height > 720:
-                            scale = 720 / original_height
-                            new_width = int(original_width * scale)
-                            frame = cv2.resize(
-                                frame, (new_width, 720), interpolation=cv2.INTER_AREA
-                            )
-                            logger.debug(
-                                f"📐 Resized frame {extracted_count + 1}: {original_width}x{original_height} → {new_width}x720"
-                            )
-
-                        # Convert frame to JPEG and encode as base64
-                        frame_base64 = frame_to_base64(frame)
-                        frames.append((timestamp, frame_base64))
-                        extracted_count += 1
-
-                        if extracted_count % 5 == 0:
-                            logger.debug(f"✅ Extracted {extracted_count} frames so far...")
-
-                    except Exception as e:
-                        logger.warning(f"⚠️  Failed to process frame at {timestamp:.2f}s: {str(e)}")
-                        # Continue with next frame instead of failing completely
-                        continue
+                # Every frame read here is a sample (the rest were grabbed above)
+                try:
+                    # Resize frame to max 720p for faster processing
+                    original_height, original_width = frame.shape[:2]
+                    if original_height > 720:
+                        scale = 720 / original_height
+                        new_width = int(original_width * scale)
+                        resized = cv2.resize(
+                            frame, (new_width, 720), dst=resized, interpolation=cv2.INTER_AREA
+                        )
+                        frame = resized
+                        logger.debug(
+                            "📐 Resized frame %d: %dx%d → %dx720",
+                            extracted_count + 1,
+                            original_width,
+                            original_height,
+                            new_width,
+                        )
+
+                    # Convert frame to JPEG bytes
+                    frame_bytes = frame_to_jpeg(frame)
+                    frames.append((timestamp, frame_bytes))
+                    extracted_count += 1
+
+                    if extracted_count % 5 == 0:
+                        logger.debug("✅ Extracted %d frames so far...", extracted_count)
+
+                except Exception as e:
+                    logger.warning(f"⚠️  Failed to process frame at {timestamp:.2f}s: {str(e)}")
+                    # Continue with next frame instead of failing completely
+                    continue
 
                 current_frame += 1
 
@@ -208,26 +262,17 @@ def extract_frames(
         logger.error(f"❌ Unexpected error in frame extraction: {str(e)}", exc_info=True)
         raise RuntimeError(f"Unexpected error during frame extraction: {str(e)}")
 
-    finally:
-        # Clean up temporary file
-        if tmp_path and os.path.exists(tmp_path):
-            try:
-                os.unlink(tmp_path)
-                logger.debug(f"🧹 Cleaned up temporary file: {tmp_path}")
-            except Exception as e:
-                logger.warning(f"⚠️  Failed to delete temporary file {tmp_path}: {str(e)}")
-
 
-def frame_to_base64(frame: np.ndarray, quality: int = 85) -> str:
+def frame_to_jpeg(frame: np.ndarray, quality: int = 85) -> bytes:
     """
-    Convert OpenCV frame to base64-encoded JPEG.
+    Convert OpenCV frame to JPEG bytes.
 
     Args:
         frame: OpenCV BGR frame
         quality: JPEG quality (1-100, default: 85)
 
     Returns:
-        Base64-encoded JPEG string
+        JPEG-encoded image bytes
 
     Raises:
         ValueError: If frame is invalid
@@ -276,22 +321,9 @@ def frame_to_base64(frame: np.ndarray, quality: int = 85) -> str:
             logger.error(f"❌ Failed to encode JPEG: {str(e)}")
             raise RuntimeError(f"JPEG encoding failed: {str(e)}")
 
-        # Encode to base64
-        try:
-            base64_str = base64.b64encode(img_bytes).decode("utf-8")
+        logger.debug("🖼️  Encoded frame: %.2f KB", len(img_bytes) / 1024)
 
-            if not base64_str:
-                raise RuntimeError("Base64 encoding resulted in empty string")
-
-        except Exception as e:
-            logger.error(f"❌ Failed to encode base64: {str(e)}")
-            raise RuntimeError(f"Base64 encoding failed: {str(e)}")
-
-        logger.debug(
-            f"🖼️  Encoded frame: {len(img_bytes) / 1024:.2f} KB → {len(base64_str) / 1024:.2f} KB base64"
-        )
-
-        return base64_str
+        return img_bytes
 
     except (ValueError, RuntimeError):
         # Re-raise known errors
@@ -299,3 +331,99 @@ def frame_to_base64(frame: np.ndarray, quality: int = 85) -> str:
     except Exception as e:
         logger.error(f"❌ Unexpected error in frame encoding: {str(e)}", exc_info=True)
         raise RuntimeError(f"Unexpected error during frame encoding: {str(e)}")
+
+
+def downscale_jpeg(
+    frame_bytes: bytes, max_dimension: int = MAX_FRAME_DIMENSION, quality: int = 80
+) -> bytes:
+    """
+    Downscale and recompress a JPEG so neither side exceeds max_dimension.
+
+    Args:
+        frame_bytes: JPEG-encoded image bytes
+        max_dimension: Maximum width/height in pixels (default: 1024)
+        quality: JPEG quality for the re-encoded image (1-100, default: 80)
+
+    Returns:
+        Re-encoded JPEG bytes
+
+    Raises:
+        RuntimeError: If the image cannot be decoded or re-encoded
+    """
+    try:
+        with Image.open(BytesIO(frame_bytes)) as image:
+            original_size = image.size
+            # thumbnail() applies the JPEG draft mode, so large frames are decoded at reduced scale
+            image.thumbnail((max_dimension, max_dimension))
+            buffer = BytesIO()
+            # convert() copies even when the mode already matches
+            (image if image.mode == "RGB" else image.convert("RGB")).save(
+                buffer, format="JPEG", quality=quality
+            )
+    except Exception as e:
+        logger.error(f"❌ Failed to downscale frame: {str(e)}")
+        raise RuntimeError(f"Frame downscaling failed: {str(e)}")
+
+    resized_bytes = buffer.getvalue()
+    logger.debug(
+        "📐 Downscaled frame %dx%d → %dx%d: %.2f KB → %.2f KB",
+        *original_size,
+        *image.size,
+        len(frame_bytes) / 1024,
+        len(resized_bytes) / 1024,
+    )
+    return resized_bytes
+
+
+def mean_luma(frame_bytes: bytes) -> float | None:
+    """
+    Compute the mean brightness of a JPEG frame.
+
+    Args:
+        frame_bytes: JPEG-encoded image bytes
+
+    Returns:
+        Mean luma from 0 (black) to 255 (white), or None if the image cannot be decoded
+    """
+    try:
+        with Image.open(BytesIO(frame_bytes)) as image:
+            # A reduced-scale decode is plenty for an average
+            image.draft("L", (64, 64))
+            return ImageStat.Stat(image.convert("L")).mean[0]
+    except Exception as e:
+        logger.debug("Could not measure frame brightness: %s", e)
+        return None
+
+
+def perceptual_hash(frame_bytes: bytes, hash_size: int = 8) -> int | None:
+    """
+    Compute a difference hash (dHash) of a JPEG frame.
+
+    Visually near-identical frames produce hashes that differ in only a few bits, so the
+    Hamming distance between two hashes measures how alike the frames look.
+
+    Args:
+        frame_bytes: JPEG-encoded image bytes
+        hash_size: Hash grid size; the hash has hash_size * hash_size bits (default: 8)
+
+    Returns:
+        Hash as an integer, or None if the image cannot be decoded
+    """
+    try:
+        with Image.open(BytesIO(frame_bytes)) as image:
+            # Let the JPEG decoder scale down while decoding instead of decoding full size
+            image.draft("L", (hash_size * 8, hash_size * 8))
+            pixels = (
+                image.convert("L")
+                .resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR)
+                .tobytes()
+            )
+    except Exception as e:
+        logger.debug("Could not hash frame: %s", e)
+        return None
+
+    value = 0
+    for row in range(0, len(pixels), hash_size + 1):
+        for col in range(row, row + hash_size):
+            value = (value << 1) | (pixels[col] < pixels[col + 1])
+    return value
@@ -31,6 +31,9 @@ def add_timestamp_overlay(video_bytes: bytes, max_duration: float | None = None)
     """
     Add timestamp overlay to video frames and re-encode.
 
+    Writes the video to a temporary file and processes it; callers that already have the
+    video on disk should use add_timestamp_overlay_from_file.
+
     Args:
         video_bytes: Video file as bytes
         max_duration: Maximum video duration in seconds (None = process full video)
@@ -53,27 +56,61 @@ def add_timestamp_overlay(video_bytes: bytes, max_duration: float | None = None)
             f"Video file too large: {len(video_bytes) / 1024 / 1024:.2f} MB (max 100MB)"
         )
 
-    logger.info("🎬 Starting timestamp overlay processing")
-    if max_duration:
-        logger.info(f"⏱️  Max duration: {max_duration}s")
-    logger.debug(f"Video size: {len(video_bytes) / 1024 / 1024:.2f} MB")
-
     tmp_input_path = None
-    tmp_output_path = None
-
     try:
         # Create temporary input file
         with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as tmp_file:
             tmp_file.write(video_bytes)
             tmp_input_path = tmp_file.name
 
-        logger.debug(f"📁 Created temporary input file: {tmp_input_path}")
+        logger.debug("📁 Created temporary input file: %s", tmp_input_path)
 
         if not os.path.exists(tmp_input_path):
             raise RuntimeError("Failed to create temporary video file")
 
+        return add_timestamp_overlay_from_file(tmp_input_path, max_duration)
+
+    except (ValueError, RuntimeError):
+        raise
+    except Exception as e:
+        logger.error(f"❌ Unexpected error in timestamp overlay: {str(e)}", exc_info=True)
+        raise RuntimeError(f"Unexpected error during timestamp overlay: {str(e)}")
+
+    finally:
+        # Clean up temporary file
+        if tmp_input_path and os.path.exists(tmp_input_path):
+            try:
+                os.unlink(tmp_input_path)
+                logger.debug("🧹 Cleaned up temporary file: %s", tmp_input_path)
+            except Exception as e:
+                logger.warning(f"⚠️  Failed to delete temporary file {tmp_input_path}: {str(e)}")
+
+
+def add_timestamp_overlay_from_file(video_path: str, max_duration: float | None = None) -> bytes:
+    """
+    Add timestamp overlay to the frames of a video file on disk and re-encode.
+
+    Args:
+        video_path: Path to the video file
+        max_duration: Maximum video duration in seconds (None = process full video)
+
+    Returns:
+        Processed video as bytes
+
+    Raises:
+        ValueError: If input validation fails
+        RuntimeError: If video processing fails
+    """
+    logger.info("🎬 Starting timestamp overlay processing")
+    if max_duration:
+        logger.info(f"⏱️  Max duration: {max_duration}s")
+    logger.debug("Video size: %.2f MB", os.path.getsize(video_path) / 1024 / 1024)
+
+    tmp_output_path = None
+
+    try:
         # Open video
-        video = cv2.VideoCapture(tmp_input_path)
+        video = cv2.VideoCapture(video_path)
 
         if not video.isOpened():
             logger.error("❌ Failed to open video file")
@@ -127,7 +164,7 @@ def add_timestamp_overlay(video_bytes: bytes, max_duration: float | None = None)
         with tempfile.NamedTemporaryFile(delete=False, suffix=".avi") as tmp_output_file:
             tmp_output_path = tmp_output_file.name
 
-        logger.debug(f"📁 Created temporary output file: {tmp_output_path}")
+        logger.debug("📁 Created temporary output file: %s", tmp_output_path)
 
         # Setup video writer with codec selection
         # Try codecs in order of preference for OpenCV compatibility
@@ -156,7 +193,7 @@ def add_timestamp_overlay(video_bytes: bytes, max_duration: float | None = None)
                         logger.info(f"✅ Using codec: {codec_name}")
                         break
             except Exception as e:
-                logger.debug(f"⚠️  Codec {codec_name} failed: {str(e)}")
+                logger.debug("⚠️  Codec %s failed: %s", codec_name, e)
                 if out:
                     try:
                         out.release()
@@ -203,7 +240,7 @@ def add_timestamp_overlay(video_bytes: bytes, max_duration: float | None = None)
             while current_frame < max_frame_number:
                 ret, frame = video.read()
                 if not ret:
-                    logger.debug(f"📹 Reached end of video at frame {current_frame}")
+                    logger.debug("📹 Reached end of video at frame %d", current_frame)
                     break
 
                 # Validate frame
@@ -218,7 +255,7 @@ def add_timestamp_overlay(video_bytes: bytes, max_duration: float | None = None)
                 # Stop if we've exceeded max_duration
                 if max_duration and timestamp_seconds >= max_duration:
                     logger.debug(
-                        f"⏹️  Reached max_duration ({max_duration}s) at frame {current_frame}"
+                        "⏹️  Reached max_duration (%ss) at frame %d", max_duration, current_frame
                     )
                     break
 
@@ -258,7 +295,7 @@ def add_timestamp_overlay(video_bytes: bytes, max_duration: float | None = None)
                 processed_frames += 1
 
                 if processed_frames % 30 == 0:
-                    logger.debug(f"✅ Processed {processed_frames} frames so far...")
+                    logger.debug("✅ Processed %d frames so far...", processed_frames)
 
                 current_frame += 1
 
@@ -299,7 +336,7 @@ def add_timestamp_overlay(video_bytes: bytes, max_duration: float | None = None)
                 test_capture.release()
                 if test_fps > 0 and test_frames > 0:
                     logger.debug(
-                        f"✅ Verified output video: {test_frames} frames @ {test_fps:.2f} FPS"
+                        "✅ Verified output video: %d frames @ %.2f FPS", test_frames, test_fps
                     )
                 else:
                     logger.warning("⚠️  Output video has invalid properties")
@@ -335,11 +372,10 @@ def add_timestamp_overlay(video_bytes: bytes, max_duration: float | None = None)
         raise RuntimeError(f"Unexpected error during timestamp overlay: {str(e)}")
 
     finally:
-        # Clean up temporary files
-        for tmp_path in [tmp_input_path, tmp_output_path]:
-            if tmp_path and os.path.exists(tmp_path):
-                try:
-                    os.unlink(tmp_path)
-                    logger.debug(f"🧹 Cleaned up temporary file: {tmp_path}")
-                except Exception as e:
-                    logger.warning(f"⚠️  Failed to delete temporary file {tmp_path}: {str(e)}")
+        # Clean up temporary output file
+        if tmp_output_path and os.path.exists(tmp_output_path):
+            try:
+                os.unlink(tmp_output_path)
+                logger.debug("🧹 Cleaned up temporary file: %s", tmp_output_path)
+            except Exception as e:
+                logger.warning(f"⚠️  Failed to delete temporary file {tmp_output_path}: {str(e)}")
@@ -0,0 +1,117 @@
+"""
+Shared fixtures for the backend tests.
+
+The analyzer reads its configuration at import time, so the environment is set up here,
+before any app module is imported. Gemini itself is never called: tests replace
+generate_analysis with a scripted fake.
+"""
+
+import asyncio
+import os
+from io import BytesIO
+
+os.environ.update(
+    AUTH_METHOD="api_key",
+    GEMINI_API_KEY="test-key",
+    RESPONSE_CACHE_PATH="",  # Keep the on-disk response cache out of the tests
+    REQUESTS_PER_MINUTE="10000",
+    FRAMES_PER_REQUEST="4",
+)
+
+import orjson  # noqa: E402
+import pytest  # noqa: E402
+from aiolimiter import AsyncLimiter  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from app import gemini_analyzer  # noqa: E402
+
+
+def make_jpeg(seed: int, size: int = 64) -> bytes:
+    """Encode a distinct, non-blank test image: a gradient whose direction depends on seed."""
+    image = Image.new("L", (size, size))
+    image.putdata(
+        [
+            40 + ((x * (seed % 5 + 1) + y * (seed // 5 + 1)) * 7) % 200
+            for y in range(size)
+            for x in range(size)
+        ]
+    )
+    buffer = BytesIO()
+    image.convert("RGB").save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def make_black_jpeg(size: int = 64) -> bytes:
+    """Encode an all-black test image."""
+    buffer = BytesIO()
+    Image.new("RGB", (size, size)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def analysis_item(event: str = "pass") -> dict:
+    """Minimal analysis object as Gemini would return it."""
+    return {"timestamp": 0.0, "players": [], "ball": {"visible": False}, "event": event}
+
+
+class FakeResponse:
+    """Stands in for an SDK response; only .text is read."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeGemini:
+    """
+    Scripted replacement for generate_analysis.
+
+    By default every request succeeds with one analysis per frame. Set error to an
+    exception to raise it on every request, or grouped_text to override the body
+    returned for multi-frame requests.
+    """
+
+    def __init__(self):
+        self.calls: list[int] = []
+        self.error: Exception | None = None
+        self.grouped_text: str | None = None
+
+    async def __call__(self, frames: list[bytes], prompt: str, frame_message: str):
+        self.calls.append(len(frames))
+        await asyncio.sleep(0)
+        if self.error is not None:
+            raise self.error
+        if len(frames) == 1:
+            return FakeResponse(orjson.dumps(analysis_item()).decode())
+        if self.grouped_text is not None:
+            return FakeResponse(self.grouped_text)
+        return FakeResponse(orjson.dumps([analysis_item()] * len(frames)).decode())
+
+
+@pytest.fixture(autouse=True)
+def isolated_analyzer(monkeypatch):
+    """Give each test empty caches, full concurrency and primitives for its own event loop."""
+    monkeypatch.setattr(gemini_analyzer, "_response_cache", type(gemini_analyzer._response_cache)())
+    monkeypatch.setattr(gemini_analyzer, "_concurrency_limit", gemini_analyzer.max_concurrency)
+    monkeypatch.setattr(gemini_analyzer, "_success_streak", 0)
+    monkeypatch.setattr(gemini_analyzer, "_slot_condition", asyncio.Condition())
+    monkeypatch.setattr(gemini_analyzer, "_prompt_cache_lock", asyncio.Lock())
+    monkeypatch.setattr(
+        gemini_analyzer,
+        "limiter",
+        AsyncLimiter(gemini_analyzer.limiter.max_rate, gemini_analyzer.limiter.time_period),
+    )
+    monkeypatch.setattr(gemini_analyzer, "_prompt_cache_disabled", True)
+
+
+@pytest.fixture
+def fake_gemini(monkeypatch) -> FakeGemini:
+    """Replace the Gemini request with a FakeGemini and skip retry backoff sleeps."""
+    fake = FakeGemini()
+    monkeypatch.setattr(gemini_analyzer, "generate_analysis", fake)
+
+    real_sleep = asyncio.sleep
+
+    async def no_backoff(delay, *args, **kwargs):
+        await real_sleep(0)
+
+    monkeypatch.setattr(gemini_analyzer.asyncio, "sleep", no_backoff)
+    return fake
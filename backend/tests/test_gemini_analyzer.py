@@ -0,0 +1,148 @@
+"""Tests for frame grouping, response parsing and caching, and batch analysis."""
+
+import asyncio
+
+import orjson
+import pytest
+from conftest import analysis_item, make_black_jpeg, make_jpeg
+
+from app import gemini_analyzer
+from app.gemini_analyzer import (
+    ServiceUnavailableError,
+    analyze_frames_batch,
+    analyze_frames_grouped,
+    find_blank_runs,
+    get_cached_response,
+    get_frame_key,
+    group_near_duplicates,
+    parse_grouped_response,
+    store_cached_response,
+)
+
+QUOTA_ERROR = RuntimeError("429 RESOURCE_EXHAUSTED: quota exceeded for free_tier requests")
+
+
+def test_parse_grouped_response_uses_request_timestamps():
+    text = orjson.dumps([analysis_item("pass"), analysis_item("shot")]).decode()
+
+    results = parse_grouped_response(text, [1.0, 2.0])
+
+    assert [result["timestamp"] for result in results] == [1.0, 2.0]
+    assert [result["event"] for result in results] == ["pass", "shot"]
+
+
+@pytest.mark.parametrize("text", ["[1, 2]", '["a", "b"]', "[null, {}]", "{}", "[{}]"])
+def test_parse_grouped_response_rejects_malformed_arrays(text):
+    with pytest.raises(ValueError):
+        parse_grouped_response(text, [1.0, 2.0])
+
+
+def test_cached_response_is_restamped_without_changing_the_cache():
+    frame_key = get_frame_key(b"frame")
+    asyncio.run(store_cached_response(frame_key, {**analysis_item(), "timestamp": 1.0}))
+
+    cached = asyncio.run(get_cached_response(frame_key, 5.0))
+
+    assert cached["timestamp"] == 5.0
+    assert asyncio.run(get_cached_response(frame_key, 1.0))["timestamp"] == 1.0
+
+
+def test_group_near_duplicates_only_joins_consecutive_frames():
+    a, b = make_jpeg(1), make_jpeg(2)
+    frames = [(0.0, a), (1.0, a), (2.0, b), (3.0, a), (4.0, b"")]
+
+    assert group_near_duplicates(frames) == [[0, 1], [2], [3], [4]]
+
+
+def test_group_near_duplicates_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(gemini_analyzer, "NEAR_DUPLICATE_DISTANCE", -1)
+    a = make_jpeg(1)
+
+    assert group_near_duplicates([(0.0, a), (1.0, a)]) == [[0], [1]]
+
+
+def test_find_blank_runs_checks_the_first_frame_of_each_run(monkeypatch):
+    frames = [(0.0, make_black_jpeg()), (1.0, make_jpeg(1)), (2.0, b"")]
+    runs = [[0], [1], [2]]
+
+    assert find_blank_runs(frames, runs) == [True, False, False]
+
+    monkeypatch.setattr(gemini_analyzer, "BLANK_FRAME_LUMA", 0)
+    assert find_blank_runs(frames, runs) == [False, False, False]
+
+
+def test_batch_results_follow_input_order(fake_gemini):
+    repeated = make_jpeg(0)
+    frames = [(0.0, repeated), (1.0, repeated), (2.0, make_black_jpeg())]
+    frames += [(float(i), make_jpeg(i)) for i in range(3, 10)]
+
+    results, quota_exhausted = asyncio.run(analyze_frames_batch(frames))
+
+    assert not quota_exhausted
+    assert [result["timestamp"] for result in results] == [timestamp for timestamp, _ in frames]
+    assert results[2]["tactical_notes"] == "Blank frame"
+    assert [result["event"] for i, result in enumerate(results) if i != 2] == ["pass"] * 9
+    # 8 distinct non-blank frames, sent 4 per request
+    assert sorted(fake_gemini.calls) == [4, 4]
+
+
+def test_batch_applies_transform_to_each_result(fake_gemini):
+    frames = [(float(i), make_jpeg(i)) for i in range(3)]
+
+    results, _ = asyncio.run(analyze_frames_batch(frames, transform=lambda r: r["timestamp"]))
+
+    assert results == [0.0, 1.0, 2.0]
+
+
+def test_batch_fills_in_defaults_when_quota_runs_out(fake_gemini):
+    fake_gemini.error = QUOTA_ERROR
+    frames = [(float(i), make_jpeg(i)) for i in range(8)]
+
+    results, quota_exhausted = asyncio.run(analyze_frames_batch(frames))
+
+    assert quota_exhausted
+    assert [result["timestamp"] for result in results] == [float(i) for i in range(8)]
+    assert {result["event"] for result in results} == {"unknown"}
+    # One request per group; quota errors are not retried or fanned out per frame
+    assert fake_gemini.calls == [4, 4]
+
+
+def test_batch_stops_retrying_when_service_stays_unavailable(fake_gemini):
+    fake_gemini.error = RuntimeError("503 UNAVAILABLE: the model is overloaded")
+    frames = [(float(i), make_jpeg(i)) for i in range(4)]
+
+    with pytest.raises(ServiceUnavailableError):
+        asyncio.run(analyze_frames_batch(frames))
+    assert fake_gemini.calls == [4, 4, 4]
+
+
+@pytest.mark.parametrize("grouped_text", ["[1, 2, 3, 4]", "[]", "not json"])
+def test_invalid_grouped_response_falls_back_to_single_frames(fake_gemini, grouped_text):
+    fake_gemini.grouped_text = grouped_text
+    frames = [(float(i), make_jpeg(i)) for i in range(4)]
+
+    results, quota_exhausted = asyncio.run(analyze_frames_batch(frames))
+
+    assert not quota_exhausted
+    assert [result["event"] for result in results] == ["pass"] * 4
+    assert fake_gemini.calls == [4, 1, 1, 1, 1]
+
+
+def test_empty_frame_does_not_break_up_its_group(fake_gemini):
+    group = [(0.0, make_jpeg(0)), (1.0, b""), (2.0, make_jpeg(2))]
+
+    results = asyncio.run(analyze_frames_grouped(group))
+
+    assert fake_gemini.calls == [2]
+    assert [result["event"] for result in results] == ["pass", "unknown", "pass"]
+    assert [result["timestamp"] for result in results] == [0.0, 1.0, 2.0]
+
+
+def test_grouped_analysis_reuses_cached_frames(fake_gemini):
+    frames = [(0.0, make_jpeg(0)), (1.0, make_jpeg(1))]
+    asyncio.run(analyze_frames_grouped(frames))
+
+    results = asyncio.run(analyze_frames_grouped([(5.0, make_jpeg(0)), (6.0, make_jpeg(1))]))
+
+    assert fake_gemini.calls == [2]
+    assert [result["timestamp"] for result in results] == [5.0, 6.0]
@@ -0,0 +1,92 @@
+"""Tests for upload spooling and result conversion in the API module."""
+
+import asyncio
+import os
+from io import BytesIO
+
+import pytest
+from fastapi import HTTPException
+from starlette.datastructures import UploadFile
+
+from app.main import remove_temp_files, spool_video, to_frame_analysis
+
+ONE_MB = 1024 * 1024
+
+
+class UnreadableFile(BytesIO):
+    def read(self, *args):
+        raise OSError("connection reset")
+
+
+def spool(upload: UploadFile, temp_paths: list[str]) -> tuple[str, str]:
+    return asyncio.run(spool_video(0, upload, 1, "Limit is 1MB.", temp_paths))
+
+
+def test_spool_video_copies_the_upload_to_disk():
+    temp_paths: list[str] = []
+    try:
+        filename, path = spool(UploadFile(BytesIO(b"video"), filename="clip.mp4"), temp_paths)
+
+        assert filename == "clip.mp4"
+        assert temp_paths == [path]
+        with open(path, "rb") as f:
+            assert f.read() == b"video"
+    finally:
+        remove_temp_files(temp_paths)
+
+
+def test_spool_video_rejects_declared_size_before_copying():
+    temp_paths: list[str] = []
+    upload = UploadFile(BytesIO(b"video"), size=ONE_MB + 1, filename="big.mp4")
+
+    with pytest.raises(HTTPException) as exc_info:
+        spool(upload, temp_paths)
+
+    assert exc_info.value.status_code == 413
+    assert "Limit is 1MB." in exc_info.value.detail
+    assert temp_paths == []
+
+
+def test_spool_video_rejects_oversized_content_without_a_declared_size():
+    temp_paths: list[str] = []
+    try:
+        with pytest.raises(HTTPException) as exc_info:
+            spool(UploadFile(BytesIO(b"x" * (ONE_MB + 1)), filename="big.mp4"), temp_paths)
+
+        assert exc_info.value.status_code == 413
+        # The partial copy is handed back for cleanup and holds no more than the limit
+        assert len(temp_paths) == 1
+        assert os.path.getsize(temp_paths[0]) <= ONE_MB
+    finally:
+        remove_temp_files(temp_paths)
+
+
+def test_spool_video_rejects_empty_upload():
+    temp_paths: list[str] = []
+    try:
+        with pytest.raises(HTTPException) as exc_info:
+            spool(UploadFile(BytesIO(b""), filename="empty.mp4"), temp_paths)
+
+        assert exc_info.value.status_code == 400
+        assert "empty" in exc_info.value.detail
+    finally:
+        remove_temp_files(temp_paths)
+
+
+def test_spool_video_reports_unreadable_upload():
+    temp_paths: list[str] = []
+
+    with pytest.raises(HTTPException) as exc_info:
+        spool(UploadFile(UnreadableFile(), filename="broken.mp4"), temp_paths)
+
+    assert exc_info.value.status_code == 400
+    assert "connection reset" in exc_info.value.detail
+    assert temp_paths == []
+
+
+def test_to_frame_analysis_defaults_non_dict_results():
+    frame = to_frame_analysis(None)
+
+    assert frame.timestamp == 0.0
+    assert frame.event == "unknown"
+    assert "Expected a result dict" in frame.tactical_notes
@@ -0,0 +1,38 @@
+"""Tests for transforming validated Gemini responses to FrameAnalysis."""
+
+from conftest import analysis_item
+
+from app.models import transform_gemini_batch, transform_gemini_response
+
+
+def test_transform_splits_teams_and_describes_the_ball():
+    response = {
+        **analysis_item("shot"),
+        "timestamp": 3.0,
+        "players": [
+            {"team": "team_a", "position": "defender"},
+            {"team": "team_b", "position": "forward"},
+        ],
+        "ball": {"visible": True, "coordinates": (0.5, 0.25)},
+    }
+
+    frame = transform_gemini_response(response)
+
+    assert frame.timestamp == 3.0
+    assert frame.event == "shot"
+    assert frame.players_detected == 2
+    assert frame.ball_position != "Not visible"
+
+
+def test_transform_batch_keeps_order_and_defaults_bad_entries():
+    results = [
+        {**analysis_item("pass"), "timestamp": 1.0},
+        None,
+        "not a response",
+        {**analysis_item("tackle"), "timestamp": 4.0},
+    ]
+
+    frames = transform_gemini_batch(results)
+
+    assert [frame.timestamp for frame in frames] == [1.0, 0.0, 0.0, 4.0]
+    assert [frame.event for frame in frames] == ["pass", "unknown", "unknown", "tackle"]
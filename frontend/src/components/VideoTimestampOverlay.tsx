@@ -243,9 +243,10 @@ export default function VideoTimestampOverlay() {
       clearInterval(progressInterval)
       setProgress(100)
 
-      // Generate filename
+      // Generate filename (multiple videos come back as one ZIP archive)
       const baseName = videos[0].file.name.replace(/\.[^/.]+$/, '')
-      const outputName = `${baseName}_timestamped.mp4`
+      const outputName =
+        blob.type === 'application/zip' ? 'timestamped_videos.zip' : `${baseName}_timestamped.mp4`
 
       setProcessedVideoBlob(blob)
       setProcessedVideoName(outputName)